@@ -133,6 +133,7 @@ CREATE INDEX `idx_status` ON `transactions` (`status`);
 CREATE INDEX `idx_reversal` ON `transactions` (`is_reversal`, `reverses_transaction_id`);
 CREATE INDEX `idx_created_at` ON `transactions` (`created_at`);
 CREATE INDEX `idx_created_by` ON `transactions` (`created_by`);
+CREATE INDEX `idx_txn_status_posting` ON `transactions` (`status`, `posting_date`);
 
 -- ============================================================================
 -- TABELA: journal_entries
@@ -195,6 +196,7 @@ CREATE INDEX `idx_cost_center` ON `journal_entries` (`cost_center`);
 CREATE INDEX `idx_business_unit` ON `journal_entries` (`business_unit`);
 CREATE INDEX `idx_project_code` ON `journal_entries` (`project_code`);
 CREATE INDEX `idx_created_at` ON `journal_entries` (`created_at`);
+CREATE INDEX `idx_je_account_txn` ON `journal_entries` (`account_code`, `transaction_id`);
 
 -- ============================================================================
 -- TABELA: closing_periods
@@ -290,6 +292,25 @@ CREATE INDEX `idx_transaction_id` ON `audit_log` (`transaction_id`);
 CREATE INDEX `idx_user_id` ON `audit_log` (`user_id`);
 CREATE INDEX `idx_source_system` ON `audit_log` (`source_system`);
 CREATE INDEX `idx_entity` ON `audit_log` (`entity_type`, `entity_id`);
+CREATE INDEX `idx_audit_ts_type` ON `audit_log` (`event_timestamp`, `event_type`);
+
+-- ============================================================================
+-- TABELA: account_balance_daily
+-- Movimento Líquido Diário por Conta (derivado, recalculável)
+-- ============================================================================
+
+DROP TABLE IF EXISTS `account_balance_daily`;
+
+CREATE TABLE `account_balance_daily` (
+    `account_code` VARCHAR(50) NOT NULL COMMENT 'Código da conta',
+    `balance_date` DATE NOT NULL COMMENT 'Dia de lançamento (UTC)',
+    `net_debit_cents` BIGINT NOT NULL COMMENT 'Débitos - créditos do dia, em centavos',
+    
+    PRIMARY KEY (`account_code`, `balance_date`)
+) ENGINE=InnoDB 
+  DEFAULT CHARSET=utf8mb4 
+  COLLATE=utf8mb4_unicode_ci
+  COMMENT='Resumo diário de saldos (recalculado por refresh_balance_summary)';
 
 -- ============================================================================
 -- VIEWS: Visões de Consulta
@@ -28,7 +28,8 @@ from enum import Enum
 from dataclasses import dataclass, asdict
 from sqlalchemy import (
     create_engine, Column, String, DateTime, Numeric, 
-    Boolean, Text, Index, CheckConstraint, ForeignKey, text
+    Boolean, Text, Index, CheckConstraint, ForeignKey, text, func, case,
+    cast, BigInteger, Date
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from dotenv import load_dotenv
@@ -47,6 +48,11 @@ class AccountType(Enum):
     EXPENSE = "EXPENSE"          # Despesa
 
 
+# Account types whose balance is debits - credits (the others: credits - debits).
+# Plain strings, so per-account loops compare without enum attribute lookups.
+DEBIT_NORMAL_ACCOUNT_TYPES = frozenset((AccountType.ASSET.value, AccountType.EXPENSE.value))
+
+
 class EntryType(Enum):
     """Entry type in double-entry accounting."""
     DEBIT = "DEBIT"      # Débito
@@ -137,6 +143,11 @@ class Transaction(Base):
         Index('idx_txn_business_key', 'business_key'),
         Index('idx_txn_status', 'status'),
         Index('idx_txn_reversal', 'is_reversal', 'reverses_transaction_id'),
+        # Report scans: status = POSTED AND posting_date <= / BETWEEN
+        Index(
+            'idx_txn_status_posting', 'status', 'posting_date',
+            postgresql_where=text("status = 'POSTED'")
+        ),
     )
 
 
@@ -174,6 +185,7 @@ class JournalEntry(Base):
         Index('idx_je_account_code', 'account_code'),
         Index('idx_je_entry_type', 'entry_type'),
         Index('idx_je_posting_date', 'posting_date'),
+        Index('idx_je_account_txn', 'account_code', 'transaction_id'),
         CheckConstraint('amount >= 0', name='chk_positive_amount'),
         CheckConstraint("entry_type IN ('DEBIT', 'CREDIT')", name='chk_entry_type'),
     )
@@ -208,10 +220,35 @@ class AuditLog(Base):
         Index('idx_audit_txn_id', 'transaction_id'),
         Index('idx_audit_user_id', 'user_id'),
         Index('idx_audit_severity', 'severity'),
+        Index('idx_audit_ts_type', 'event_timestamp', 'event_type'),
         CheckConstraint("severity IN ('INFO', 'WARNING', 'ERROR', 'CRITICAL')", name='chk_severity'),
     )
 
 
+class AccountBalanceDaily(Base):
+    """
+    Net posted movement per account and posting day (UTC) - derived data.
+    
+    Rebuilt by LedgerReportEngine.refresh_balance_summary(); never written
+    by the ledger itself, so it can always be dropped and recomputed.
+    """
+    __tablename__ = 'account_balance_daily'
+    
+    account_code = Column(String(50), primary_key=True)
+    balance_date = Column(Date, primary_key=True)
+    net_debit_cents = Column(BigInteger, nullable=False)  # Debits - credits, in cents
+
+
+def amount_in_cents():
+    """
+    SQL expression for JournalEntry.amount as integer cents.
+    
+    Amounts have two decimal places, so summing cents is exact on every
+    backend (SQLite stores NUMERIC as float and sums it as float).
+    """
+    return cast(func.round(JournalEntry.amount * 100), BigInteger)
+
+
 # ========================
 # INPUT DATA CLASSES
 # ========================
@@ -319,12 +356,18 @@ class LedgerEngine:
     - Support for reversals
     """
     
-    def __init__(self, db_uri: Optional[str] = None):
+    def __init__(
+        self,
+        db_uri: Optional[str] = None,
+        engine_kwargs: Optional[Dict[str, Any]] = None
+    ):
         """
         Initialize Ledger Engine.
         
         Args:
             db_uri: Database connection string. If None, uses LEDGER_DB_URI from environment.
+            engine_kwargs: Extra create_engine() arguments (e.g. poolclass,
+                connect_args), overriding the defaults below
         """
         self.db_uri = db_uri or os.getenv('LEDGER_DB_URI')
         
@@ -336,7 +379,8 @@ class LedgerEngine:
             self.db_uri,
             echo=False,
             pool_pre_ping=True,
-            pool_recycle=3600
+            pool_recycle=3600,
+            **(engine_kwargs or {})
         )
         
         # Create tables
@@ -423,14 +467,15 @@ class LedgerEngine:
         entity_type: Optional[str] = None,
         entity_id: Optional[str] = None,
         source_ip: Optional[str] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        event_timestamp: Optional[datetime] = None
     ) -> str:
-        """Log audit event."""
+        """Log audit event (timestamped now unless event_timestamp is given)."""
         audit_id = str(uuid.uuid4())
         
         audit_log = AuditLog(
             audit_id=audit_id,
-            event_timestamp=datetime.now(timezone.utc),
+            event_timestamp=event_timestamp or datetime.now(timezone.utc),
             event_type=event_type,
             severity=severity.value,
             transaction_id=transaction_id,
@@ -466,70 +511,112 @@ class LedgerEngine:
         Returns:
             account_id: UUID of created account
         """
-        account_def.validate()
+        return self.create_accounts([account_def], created_by)[0]
+    
+    def create_accounts(
+        self,
+        account_defs: List[AccountDefinition],
+        created_by: str
+    ) -> List[str]:
+        """
+        Create several accounts in a single transaction.
+        
+        Either all accounts are created or none. A parent may be another
+        account of the same batch if it comes first.
+        
+        Args:
+            account_defs: Account definitions, parents before children
+            created_by: User creating the accounts
+        
+        Returns:
+            account_ids: UUIDs of the created accounts, in input order
+        """
+        for account_def in account_defs:
+            account_def.validate()
+        
+        codes = [account_def.account_code for account_def in account_defs]
+        
+        if len(set(codes)) != len(codes):
+            raise ValueError("Duplicate account codes in batch")
         
         with self.SessionLocal() as session:
             try:
-                # Check if account code exists
-                existing = session.query(ChartOfAccounts)\
-                    .filter(ChartOfAccounts.account_code == account_def.account_code)\
+                # Check if any account code exists
+                existing = session.query(ChartOfAccounts.account_code)\
+                    .filter(ChartOfAccounts.account_code.in_(codes))\
                     .first()
                 
                 if existing:
-                    raise ValueError(f"Account code {account_def.account_code} already exists")
-                
-                # Determine level and parent
-                parent_account = None
-                level = 1
-                
-                if account_def.parent_account_code:
-                    parent_account = session.query(ChartOfAccounts)\
-                        .filter(ChartOfAccounts.account_code == account_def.parent_account_code)\
-                        .first()
-                    
-                    if not parent_account:
-                        raise ValueError(f"Parent account {account_def.parent_account_code} not found")
-                    
-                    level = parent_account.level + 1
+                    raise ValueError(f"Account code {existing.account_code} already exists")
                 
-                # Create account
-                account_id = str(uuid.uuid4())
+                # Parents outside the batch, loaded at once
+                parent_codes = {
+                    account_def.parent_account_code for account_def in account_defs
+                    if account_def.parent_account_code
+                } - set(codes)
                 
-                account = ChartOfAccounts(
-                    account_id=account_id,
-                    account_code=account_def.account_code,
-                    account_name=account_def.account_name,
-                    account_type=account_def.account_type.value,
-                    parent_account_id=parent_account.account_id if parent_account else None,
-                    level=level,
-                    is_active=True,
-                    description=account_def.description,
-                    created_at=datetime.now(timezone.utc),
-                    created_by=created_by,
-                    version=1
-                )
+                accounts_by_code = {
+                    account.account_code: account
+                    for account in session.query(ChartOfAccounts)
+                        .filter(ChartOfAccounts.account_code.in_(parent_codes))
+                }
                 
-                session.add(account)
+                account_ids = []
+                now = datetime.now(timezone.utc)
                 
-                # Log audit
-                self._log_audit(
-                    session=session,
-                    event_type="ACCOUNT_CREATED",
-                    severity=SeverityLevel.INFO,
-                    action="CREATE_ACCOUNT",
-                    description=f"Account created: {account_def.account_code} - {account_def.account_name}",
-                    user_id=created_by,
-                    source_system="LEDGER_ENGINE",
-                    entity_type="ACCOUNT",
-                    entity_id=account_id,
-                    metadata={
-                        'account_code': account_def.account_code,
-                        'account_type': account_def.account_type.value
-                    }
-                )
+                for account_def in account_defs:
+                    # Determine level and parent
+                    parent_account = None
+                    level = 1
+                    
+                    if account_def.parent_account_code:
+                        parent_account = accounts_by_code.get(account_def.parent_account_code)
+                        
+                        if not parent_account:
+                            raise ValueError(f"Parent account {account_def.parent_account_code} not found")
+                        
+                        level = parent_account.level + 1
+                    
+                    # Create account
+                    account_id = str(uuid.uuid4())
+                    
+                    account = ChartOfAccounts(
+                        account_id=account_id,
+                        account_code=account_def.account_code,
+                        account_name=account_def.account_name,
+                        account_type=account_def.account_type.value,
+                        parent_account_id=parent_account.account_id if parent_account else None,
+                        level=level,
+                        is_active=True,
+                        description=account_def.description,
+                        created_at=now,
+                        created_by=created_by,
+                        version=1
+                    )
+                    
+                    session.add(account)
+                    accounts_by_code[account_def.account_code] = account
+                    account_ids.append(account_id)
+                    
+                    # Log audit
+                    self._log_audit(
+                        session=session,
+                        event_type="ACCOUNT_CREATED",
+                        severity=SeverityLevel.INFO,
+                        action="CREATE_ACCOUNT",
+                        description=f"Account created: {account_def.account_code} - {account_def.account_name}",
+                        user_id=created_by,
+                        source_system="LEDGER_ENGINE",
+                        entity_type="ACCOUNT",
+                        entity_id=account_id,
+                        metadata={
+                            'account_code': account_def.account_code,
+                            'account_type': account_def.account_type.value
+                        }
+                    )
                 
                 session.commit()
-                return account_id
+                return account_ids
                 
             except Exception as e:
                 session.rollback()
@@ -830,8 +917,21 @@ class LedgerEngine:
             if not account:
                 raise ValueError(f"Account {account_code} not found")
             
-            # Build query
-            query = session.query(JournalEntry)\
+            account_type = account.account_type
+            
+            # Sum debits and credits in the database, in cents
+            cents = amount_in_cents()
+            
+            query = session.query(
+                func.coalesce(func.sum(case(
+                    (JournalEntry.entry_type == EntryType.DEBIT.value, cents),
+                    else_=0
+                )), 0),
+                func.coalesce(func.sum(case(
+                    (JournalEntry.entry_type == EntryType.CREDIT.value, cents),
+                    else_=0
+                )), 0)
+            )\
                 .join(Transaction)\
                 .filter(
                     JournalEntry.account_code == account_code,
@@ -841,22 +941,12 @@ class LedgerEngine:
             if as_of_date:
                 query = query.filter(Transaction.posting_date <= as_of_date)
             
-            entries = query.all()
+            debit_cents, credit_cents = query.one()
+            total_debits = Decimal(int(debit_cents)).scaleb(-2)
+            total_credits = Decimal(int(credit_cents)).scaleb(-2)
             
             # Calculate balance based on account type
-            total_debits = Decimal('0')
-            total_credits = Decimal('0')
-            
-            for entry in entries:
-                if entry.entry_type == 'DEBIT':
-                    total_debits += entry.amount
-                else:
-                    total_credits += entry.amount
-            
-            # Calculate balance based on account type
-            account_type = AccountType(account.account_type)
-            
-            if account_type in [AccountType.ASSET, AccountType.EXPENSE]:
+            if account_type in DEBIT_NORMAL_ACCOUNT_TYPES:
                 balance = total_debits - total_credits
             else:  # LIABILITY, EQUITY, REVENUE
                 balance = total_credits - total_debits
@@ -870,41 +960,46 @@ class LedgerEngine:
         """
         Verify double-entry integrity.
         
+        Debits and credits of every posted transaction are summed in one
+        grouped query; only unbalanced transactions are returned.
+        
         Returns:
             (is_valid, error_messages)
         """
         with self.SessionLocal() as session:
-            errors = []
+            cents = amount_in_cents()
+            debit_cents = func.sum(case(
+                (JournalEntry.entry_type == EntryType.DEBIT.value, cents),
+                else_=0
+            ))
+            credit_cents = func.sum(case(
+                (JournalEntry.entry_type == EntryType.DEBIT.value, 0),
+                else_=cents
+            ))
             
-            # Build query
-            query = session.query(Transaction)\
+            query = session.query(
+                Transaction.transaction_number,
+                debit_cents,
+                credit_cents
+            )\
+                .join(JournalEntry, JournalEntry.transaction_id == Transaction.transaction_id)\
                 .filter(Transaction.status == TransactionStatus.POSTED.value)
             
             if transaction_id:
                 query = query.filter(Transaction.transaction_id == transaction_id)
             
-            transactions = query.all()
+            unbalanced = query\
+                .group_by(Transaction.transaction_id, Transaction.transaction_number)\
+                .having(debit_cents != credit_cents)\
+                .order_by(Transaction.transaction_number)\
+                .all()
             
-            for txn in transactions:
-                # Get entries
-                entries = session.query(JournalEntry)\
-                    .filter(JournalEntry.transaction_id == txn.transaction_id)\
-                    .all()
-                
-                total_debits = Decimal('0')
-                total_credits = Decimal('0')
-                
-                for entry in entries:
-                    if entry.entry_type == 'DEBIT':
-                        total_debits += entry.amount
-                    else:
-                        total_credits += entry.amount
-                
-                if total_debits != total_credits:
-                    errors.append(
-                        f"Transaction {txn.transaction_number}: "
-                        f"Debits ({total_debits}) != Credits ({total_credits})"
-                    )
+            errors = [
+                f"Transaction {transaction_number}: "
+                f"Debits ({Decimal(int(debits)).scaleb(-2)}) != "
+                f"Credits ({Decimal(int(credits)).scaleb(-2)})"
+                for transaction_number, debits, credits in unbalanced
+            ]
             
             return (len(errors) == 0, errors)
     
@@ -916,27 +1011,59 @@ class LedgerEngine:
         Get trial balance report.
         
         Returns list of accounts with debits, credits, and balances.
+        Balances of all accounts come from one grouped query joined to the
+        chart of accounts (so accounts created by other processes are
+        included), signed as in get_account_balance().
         """
         with self.SessionLocal() as session:
-            # Get all active accounts
-            accounts = session.query(ChartOfAccounts)\
+            # Net debit per account, in cents
+            cents = amount_in_cents()
+            
+            totals = session.query(
+                JournalEntry.account_code,
+                func.sum(case(
+                    (JournalEntry.entry_type == EntryType.DEBIT.value, cents),
+                    else_=-cents
+                )).label('net_debit')
+            )\
+                .join(Transaction)\
+                .filter(Transaction.status == TransactionStatus.POSTED.value)
+            
+            if as_of_date:
+                totals = totals.filter(Transaction.posting_date <= as_of_date)
+            
+            totals = totals.group_by(JournalEntry.account_code).subquery()
+            
+            rows = session.query(
+                ChartOfAccounts.account_code,
+                ChartOfAccounts.account_name,
+                ChartOfAccounts.account_type,
+                totals.c.net_debit
+            )\
+                .outerjoin(totals, totals.c.account_code == ChartOfAccounts.account_code)\
                 .filter(ChartOfAccounts.is_active == True)\
                 .order_by(ChartOfAccounts.account_code)\
                 .all()
+        
+        trial_balance = []
+        
+        for account_code, account_name, account_type, net_debit in rows:
+            # MySQL/PostgreSQL return SUM(BIGINT) as Decimal
+            net_debit = int(net_debit or 0)
             
-            trial_balance = []
+            if account_type not in DEBIT_NORMAL_ACCOUNT_TYPES:
+                net_debit = -net_debit
             
-            for account in accounts:
-                balance = self.get_account_balance(account.account_code, as_of_date)
-                
-                trial_balance.append({
-                    'account_code': account.account_code,
-                    'account_name': account.account_name,
-                    'account_type': account.account_type,
-                    'balance': balance
-                })
+            balance = Decimal(net_debit).scaleb(-2)
             
-            return trial_balance
+            trial_balance.append({
+                'account_code': account_code,
+                'account_name': account_name,
+                'account_type': account_type,
+                'balance': balance
+            })
+        
+        return trial_balance
 
 
 def main():
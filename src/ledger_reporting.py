@@ -14,25 +14,237 @@ Version: 1.0.0
 """
 
 import os
+import atexit
 import hashlib
+import uuid
 import json
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from decimal import Decimal
-from dataclasses import dataclass, asdict
+import warnings
+import copy
+import csv
+import threading
+from datetime import datetime, date, time, timezone, timedelta
+from typing import Dict, List, Optional, Any, Callable, Iterator, Iterable, Tuple
+from itertools import islice
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from dataclasses import dataclass
 import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import (
+    func, case, inspect, literal_column, select, union_all, insert, delete,
+    bindparam
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 from dotenv import load_dotenv
 
 from src.ledger_engine import (
-    LedgerEngine, AccountType, TransactionStatus, SeverityLevel,
-    Base, ChartOfAccounts, Transaction, JournalEntry, AuditLog
+    LedgerEngine, AccountType, EntryType, TransactionStatus, SeverityLevel,
+    ChartOfAccounts, Transaction, JournalEntry, AuditLog,
+    AccountBalanceDaily, DEBIT_NORMAL_ACCOUNT_TYPES, amount_in_cents
 )
 
+try:
+    import orjson
+except ImportError:  # Optional: C-accelerated canonical JSON
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # Optional: compact msgpack report hashing
+    ormsgpack = None
+
+try:
+    import blake3
+except ImportError:  # Optional: faster (non-FIPS) report hashing
+    blake3 = None
+
 load_dotenv()
 
 
+# Indexes the report queries rely on: table -> index names
+REPORT_INDEXES = {
+    'transactions': ('idx_txn_status_posting',),
+    'journal_entries': ('idx_je_account_txn',),
+    'audit_log': ('idx_audit_ts_type',),
+}
+
+# Rows fetched per round-trip when streaming general ledger entries
+GL_CHUNK_SIZE = 10_000
+
+# Rows serialized per hash update for list members of a report
+HASH_BATCH_ROWS = 1_000
+
+# Audit events that change report results; reports are cached until one is logged.
+# Every input of a cached report (chart of accounts, postings, balance summary)
+# must only change together with one of these events.
+LEDGER_MUTATION_EVENTS = (
+    'ACCOUNT_CREATED', 'TRANSACTION_POSTED', 'TRANSACTION_REVERSED',
+    'BALANCE_SUMMARY_REFRESHED'
+)
+
+# Days a posting day must be closed before the balance summary may cover it,
+# so transactions still in flight (or committed late) at midnight are included
+BALANCE_SUMMARY_MARGIN_DAYS = 2
+
+# Distinct (report type, parameters) combinations kept in the report cache
+# (default for LedgerReportEngine's report_cache_size)
+REPORT_CACHE_SIZE = 128
+
+# Report hash schemes (stored in each report as 'hash_scheme').
+# Reports without the field predate it and use the legacy serialization.
+HASH_SCHEME_LEGACY = 'json-sha256-v1'
+HASH_SCHEME = 'canonical-json-sha256-v2'
+HASH_SCHEME_MSGPACK = 'msgpack-sha256-v1'
+HASH_SCHEME_BLAKE3 = 'canonical-json-blake3-v1'
+
+# repr (and so the stdlib encoder) writes floats with magnitude in this range
+# without an exponent, with the same shortest digits as orjson; outside it the
+# two disagree (1e+16 vs 1e16).
+_PLAIN_FLOAT_MIN = 1e-4
+_PLAIN_FLOAT_MAX = 1e16
+
+# Integer range orjson serializes (beyond it, it raises)
+_ORJSON_INT_MIN = -2 ** 63
+_ORJSON_INT_MAX = 2 ** 64 - 1
+
+# Fixed-shape lookups run on every report request (cache checks included).
+# Built once at import: SQLAlchemy then only has to hit its compiled cache.
+_LEDGER_WATERMARK_STMT = select(
+        func.count(AuditLog.audit_id),
+        func.max(AuditLog.event_timestamp)
+    )\
+    .where(AuditLog.event_type.in_(LEDGER_MUTATION_EVENTS))
+
+_LATEST_SUMMARY_REFRESH_STMT = select(AuditLog.event_timestamp, AuditLog.event_metadata)\
+    .where(AuditLog.event_type == "BALANCE_SUMMARY_REFRESHED")\
+    .order_by(AuditLog.event_timestamp.desc())\
+    .limit(1)
+
+_REVERSAL_SINCE_STMT = select(AuditLog.audit_id)\
+    .where(
+        AuditLog.event_type == "TRANSACTION_REVERSED",
+        AuditLog.event_timestamp >= bindparam('since')
+    )\
+    .limit(1)
+
+# Background writer for REPORT_GENERATED events, shared by every engine with
+# async_report_metadata; created on first use and shut down at exit
+_metadata_pool: Optional[ThreadPoolExecutor] = None
+_metadata_pool_lock = threading.Lock()
+
+
+def _get_metadata_pool() -> ThreadPoolExecutor:
+    """Shared report audit writer (a single thread, so events stay in order)."""
+    global _metadata_pool
+    
+    with _metadata_pool_lock:
+        if _metadata_pool is None:
+            _metadata_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='report-metadata'
+            )
+            atexit.register(_metadata_pool.shutdown, wait=True)
+        
+        return _metadata_pool
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize non-JSON types the way orjson does natively."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _digest_lines(lines: Iterable[str]) -> str:
+    """SHA-256 hex digest of lines joined with newlines."""
+    hasher = hashlib.sha256()
+    separator = b''
+    
+    for line in lines:
+        hasher.update(separator + line.encode('utf-8'))
+        separator = b'\n'
+    
+    return hasher.hexdigest()
+
+
+def _warn_on_metadata_failure(future) -> None:
+    """Surface a failed background report audit write."""
+    error = future.exception()
+    if error is not None:
+        warnings.warn(f"Report audit event was not saved: {error}", RuntimeWarning)
+
+
+def _utc_day_start(day: date) -> datetime:
+    """Midnight UTC at the start of day."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _orjson_matches_stdlib(value: Any) -> bool:
+    """
+    Whether orjson encodes value byte-identically to the stdlib encoder.
+    
+    They differ on floats in exponent form, on NaN/Infinity (null under
+    orjson), on float subclasses (passed to default, so quoted) and on UTC
+    offsets with seconds (truncated by orjson); orjson rejects non-str dict
+    keys and ints beyond 64 bits.
+    """
+    pending = [value]
+    
+    while pending:
+        item = pending.pop()
+        if isinstance(item, dict):
+            if not all(isinstance(key, str) for key in item):
+                return False
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif isinstance(item, Enum):
+            pending.append(item.value)
+        elif isinstance(item, float):
+            if type(item) is not float:
+                return False
+            # Also false for NaN and ±Infinity
+            if item and not _PLAIN_FLOAT_MIN <= abs(item) < _PLAIN_FLOAT_MAX:
+                return False
+        elif isinstance(item, datetime):
+            offset = item.utcoffset()
+            if offset is not None and (offset.seconds % 60 or offset.microseconds):
+                return False
+        elif isinstance(item, int):
+            if not _ORJSON_INT_MIN <= item <= _ORJSON_INT_MAX:
+                return False
+    
+    return True
+
+
+def _canonical_json(value: Any) -> bytes:
+    """
+    Canonical serialization for report hashes: sorted keys, no whitespace, UTF-8.
+    
+    The format is the stdlib json encoder's, so NaN and ±Infinity are
+    written as NaN/Infinity and non-str keys are converted to strings.
+    orjson is used as a fast path when installed and value holds nothing
+    it would encode differently (see _orjson_matches_stdlib); any orjson
+    error also falls back to the stdlib encoder.
+    """
+    if orjson is not None and _orjson_matches_stdlib(value):
+        try:
+            return orjson.dumps(value, default=_json_default, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    
+    return json.dumps(
+        value,
+        sort_keys=True,
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(',', ':')
+    ).encode()
+
+
 @dataclass
 class ReportMetadata:
     """Metadata for report generation."""
@@ -57,24 +269,203 @@ class LedgerReportEngine:
     - Cryptographically signed
     """
     
-    def __init__(self, ledger_engine: Optional[LedgerEngine] = None):
-        """Initialize report engine."""
+    def __init__(
+        self,
+        ledger_engine: Optional[LedgerEngine] = None,
+        hash_scheme: str = HASH_SCHEME,
+        async_report_metadata: bool = False,
+        report_cache_size: int = REPORT_CACHE_SIZE
+    ):
+        """
+        Initialize report engine.
+        
+        Args:
+            ledger_engine: Ledger to report on. If None, a new LedgerEngine is created.
+            hash_scheme: Hash scheme for new reports: HASH_SCHEME (SHA-256,
+                the default for FIPS environments), HASH_SCHEME_MSGPACK
+                (requires ormsgpack) or HASH_SCHEME_BLAKE3 (requires blake3)
+            async_report_metadata: Write REPORT_GENERATED audit events on a
+                background thread instead of before returning the report.
+                Off by default: with it on, a report can be returned before
+                its audit event is durable (see flush_report_metadata()).
+                Ignored for single-connection pools (in-memory SQLite).
+            report_cache_size: Distinct report requests kept in the report
+                cache (0 disables it)
+        """
+        if hash_scheme not in (HASH_SCHEME, HASH_SCHEME_MSGPACK, HASH_SCHEME_BLAKE3):
+            raise ValueError(f"Unknown hash scheme: {hash_scheme}")
+        
+        if hash_scheme == HASH_SCHEME_MSGPACK and ormsgpack is None:
+            raise ValueError(f"Hash scheme {hash_scheme} requires ormsgpack")
+        
+        if hash_scheme == HASH_SCHEME_BLAKE3 and blake3 is None:
+            raise ValueError(f"Hash scheme {hash_scheme} requires blake3")
+        
+        self.hash_scheme = hash_scheme
+        
         if ledger_engine:
             self.ledger = ledger_engine
         else:
             self.ledger = LedgerEngine()
         
         self.session_factory = self.ledger.SessionLocal
+        
+        self._metadata_pool = None
+        if async_report_metadata and not self._single_connection():
+            self._metadata_pool = _get_metadata_pool()
+        
+        # (report_type, parameters hash) -> (ledger watermark, report, audit
+        # parameters), or None for a request seen once and not yet cached.
+        # generate_all() workers share it, hence the lock.
+        self._report_cache_size = report_cache_size
+        self._report_cache: Dict[Tuple[str, str], Optional[Tuple]] = {}
+        self._report_cache_lock = threading.Lock()
+        
+        # create_all() does not add indexes to tables that already exist,
+        # so databases created before they were declared may lack them.
+        missing = self.get_missing_report_indexes()
+        if missing:
+            warnings.warn(
+                f"Missing report indexes: {', '.join(missing)}. "
+                "Report queries will fall back to full scans; "
+                "see scripts/create_database.sql.",
+                RuntimeWarning
+            )
+    
+    def _single_connection(self) -> bool:
+        """
+        Check if the database is only reachable through one connection.
+        
+        In-memory SQLite uses SingletonThreadPool, which gives every thread
+        its own (empty) database, or StaticPool, whose single connection
+        must not be used by two threads at once. Work is then kept on the
+        calling thread.
+        """
+        return isinstance(self.ledger.engine.pool, (SingletonThreadPool, StaticPool))
+    
+    def get_missing_report_indexes(self) -> List[str]:
+        """
+        Check that the indexes used by report queries exist.
+        
+        Returns:
+            List of missing index names (empty if all present)
+        """
+        inspector = inspect(self.ledger.engine)
+        missing = []
+        
+        for table_name, index_names in REPORT_INDEXES.items():
+            existing = {index['name'] for index in inspector.get_indexes(table_name)}
+            missing.extend(name for name in index_names if name not in existing)
+        
+        return missing
     
     def _generate_report_id(self) -> str:
         """Generate unique report ID."""
-        import uuid
         return str(uuid.uuid4())
     
-    def _calculate_report_hash(self, report_data: Dict[str, Any]) -> str:
-        """Calculate SHA-256 hash for report integrity."""
-        json_str = json.dumps(report_data, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+    def _calculate_report_hash(
+        self,
+        report_data: Dict[str, Any],
+        skip_keys: Tuple[str, ...] = ()
+    ) -> str:
+        """
+        Calculate hash for report integrity.
+        
+        The serialization and digest depend on the report's hash_scheme;
+        reports without one are hashed with the legacy json.dumps format. Top-level
+        keys in skip_keys are left out, as if absent from the report.
+        """
+        hash_scheme = report_data.get('hash_scheme', HASH_SCHEME_LEGACY)
+        
+        if hash_scheme == HASH_SCHEME_LEGACY:
+            if skip_keys:
+                report_data = {
+                    key: value for key, value in report_data.items()
+                    if key not in skip_keys
+                }
+            blob = json.dumps(report_data, sort_keys=True, default=str).encode()
+            return hashlib.sha256(blob).hexdigest()
+        
+        if hash_scheme == HASH_SCHEME_MSGPACK:
+            if ormsgpack is None:
+                raise ValueError(f"Hash scheme {hash_scheme} requires ormsgpack")
+            
+            members = {
+                key: value for key, value in report_data.items()
+                if key not in skip_keys
+            }
+            blob = ormsgpack.packb(
+                members,
+                option=ormsgpack.OPT_SORT_KEYS,
+                default=_json_default
+            )
+            return hashlib.sha256(blob).hexdigest()
+        
+        # Hash incrementally instead of serializing the whole report at once
+        hasher = self._canonical_hasher(hash_scheme)
+        hasher.update(b'{')
+        for chunk in self._iter_canonical_members(report_data, skip_keys):
+            hasher.update(chunk)
+        hasher.update(b'}')
+        
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def _canonical_hasher(hash_scheme: str):
+        """New digest object for a canonical JSON hash scheme."""
+        if hash_scheme == HASH_SCHEME:
+            return hashlib.sha256()
+        
+        if hash_scheme == HASH_SCHEME_BLAKE3:
+            if blake3 is None:
+                raise ValueError(f"Hash scheme {hash_scheme} requires blake3")
+            return blake3.blake3()
+        
+        raise ValueError(f"Unknown hash scheme: {hash_scheme}")
+    
+    def _iter_canonical_members(
+        self,
+        report_data: Dict[str, Any],
+        skip_keys: Tuple[str, ...] = (),
+        late_members: Optional[Dict[str, Callable[[], Any]]] = None
+    ) -> Iterator[bytes]:
+        """
+        Yield the canonical serialization of a report's members.
+        
+        Wrapped in braces, the chunks are byte-identical to
+        _canonical_json(report_data). List values (entries, accounts) are
+        serialized HASH_BATCH_ROWS rows at a time, so no buffer holds the
+        whole report. Iterators are accepted in place of lists. Keys in
+        skip_keys are omitted.
+        
+        late_members are members only known after streaming (e.g. counts):
+        each function is called for its value when its key is reached in
+        sorted order.
+        """
+        late_members = late_members or {}
+        separator = b''
+        
+        for key in sorted({**report_data, **late_members}):
+            if key in skip_keys:
+                continue
+            
+            if key in late_members:
+                value = late_members[key]()
+            else:
+                value = report_data[key]
+            
+            yield separator + _canonical_json(key) + b':'
+            separator = b','
+            
+            if isinstance(value, (list, tuple, Iterator)):
+                rows = iter(value)
+                yield b'['
+                for index, batch in enumerate(iter(lambda: list(islice(rows, HASH_BATCH_ROWS)), [])):
+                    # Serialized batch without its enclosing brackets
+                    yield (b',' if index else b'') + _canonical_json(batch)[1:-1]
+                yield b']'
+            else:
+                yield _canonical_json(value)
     
     def _save_report_metadata(
         self,
@@ -83,10 +474,53 @@ class LedgerReportEngine:
         report_name: str,
         parameters: Dict,
         generated_by: str,
-        report_hash: str
+        report_hash: str,
+        generated_at: Optional[datetime] = None,
+        session: Optional[Session] = None,
+        cache_hit: bool = False
     ):
-        """Save report metadata for audit trail."""
-        with self.session_factory() as session:
+        """
+        Save report metadata for audit trail.
+        
+        generated_at stamps the audit event with the report's own
+        generated_at. Pass the session the report was read with to log the
+        event and commit in that same transaction; otherwise a new session
+        is used.
+        
+        With async_report_metadata the event is queued for the background
+        writer instead, in its own session.
+        
+        cache_hit marks a request served from the report cache: the event
+        references the cached report_id and hash and is stamped now.
+        """
+        if self._metadata_pool:
+            future = self._metadata_pool.submit(
+                self._save_report_metadata_sync,
+                report_id, report_type, report_name, parameters,
+                generated_by, report_hash, generated_at, None, cache_hit
+            )
+            future.add_done_callback(_warn_on_metadata_failure)
+            return
+        
+        self._save_report_metadata_sync(
+            report_id, report_type, report_name, parameters,
+            generated_by, report_hash, generated_at, session, cache_hit
+        )
+    
+    def _save_report_metadata_sync(
+        self,
+        report_id: str,
+        report_type: str,
+        report_name: str,
+        parameters: Dict,
+        generated_by: str,
+        report_hash: str,
+        generated_at: Optional[datetime] = None,
+        session: Optional[Session] = None,
+        cache_hit: bool = False
+    ):
+        """Log the REPORT_GENERATED audit event and commit."""
+        with nullcontext(session) if session else self.session_factory() as session:
             metadata = {
                 'report_id': report_id,
                 'report_type': report_type,
@@ -95,18 +529,347 @@ class LedgerReportEngine:
                 'report_hash': report_hash
             }
             
+            if cache_hit:
+                metadata['cache_hit'] = True
+                description = f"Report {report_type} served from cache: {report_name}"
+            else:
+                description = f"Report {report_type} generated: {report_name}"
+            
             # Corrigido: Adicionado parâmetro severity
             self.ledger._log_audit(
                 session=session,
                 event_type="REPORT_GENERATED",
                 severity=SeverityLevel.INFO,
                 action="GENERATE_REPORT",
-                description=f"Report {report_type} generated: {report_name}",
+                description=description,
                 user_id=generated_by,
                 source_system="REPORT_ENGINE",
-                metadata=metadata
+                metadata=metadata,
+                event_timestamp=generated_at
+            )
+            session.commit()
+    
+    def flush_report_metadata(self):
+        """Wait until every queued report audit event has been written."""
+        if self._metadata_pool:
+            # The writer runs jobs in order: once this one ran, all earlier did
+            # (other engines' queued events included)
+            self._metadata_pool.submit(lambda: None).result()
+    
+    # ========================
+    # REPORT CACHE
+    # ========================
+    
+    def _ledger_watermark(self) -> Tuple:
+        """
+        Count and latest timestamp of ledger mutation events.
+        
+        The audit log is append-only, so the watermark changes whenever an
+        account is created or a transaction is posted or reversed.
+        """
+        with self.session_factory() as session:
+            return tuple(session.execute(_LEDGER_WATERMARK_STMT).one())
+    
+    def _lookup_report_cache(
+        self,
+        report_type: str,
+        parameters: Dict[str, Any]
+    ) -> Tuple[Tuple, Optional[Dict[str, Any]]]:
+        """
+        Look up a report generated earlier with the same parameters.
+        
+        Reports are reproducible, so one generated before the latest ledger
+        mutation is still valid and is returned as is (same report_id, hash
+        and generated_at). The request is still audited: a hit logs a
+        REPORT_GENERATED event (marked cache_hit) referencing the cached
+        report. parameters must include generated_by.
+        
+        Only repeated requests are cached: the first request for a key is
+        just remembered, so one-off reports skip the watermark query.
+        
+        Returns:
+            (cache entry to pass to _store_report_cache or None if the report
+            is not to be cached, cached report or None)
+        """
+        if not self._report_cache_size:
+            return None, None
+        
+        key = (report_type, hashlib.sha256(_canonical_json(parameters)).hexdigest())
+        
+        with self._report_cache_lock:
+            if key not in self._report_cache:
+                self._evict_report_cache()
+                self._report_cache[key] = None
+                return None, None
+            
+            cached = self._report_cache[key]
+        
+        watermark = self._ledger_watermark()
+        
+        if cached and cached[0] == watermark:
+            cached_watermark, report, audit_parameters = cached
+            
+            self._save_report_metadata(
+                report_id=report['report_id'],
+                report_type=report_type,
+                report_name=report['report_name'],
+                parameters=audit_parameters,
+                generated_by=parameters['generated_by'],
+                report_hash=report['report_hash'],
+                cache_hit=True
+            )
+            
+            return (key, watermark), copy.deepcopy(report)
+        
+        return (key, watermark), None
+    
+    def _store_report_cache(
+        self,
+        cache_entry: Optional[Tuple],
+        report: Dict[str, Any],
+        audit_parameters: Dict[str, Any]
+    ):
+        """
+        Cache a report under the watermark read before it was generated.
+        
+        audit_parameters are the parameters logged with the report's
+        REPORT_GENERATED event, logged again on cache hits.
+        """
+        if cache_entry is None:
+            return
+        
+        key, watermark = cache_entry
+        entry = (watermark, copy.deepcopy(report), audit_parameters)
+        
+        with self._report_cache_lock:
+            if key not in self._report_cache:
+                self._evict_report_cache()
+            self._report_cache[key] = entry
+    
+    def _evict_report_cache(self):
+        """Make room for a new key (caller holds _report_cache_lock)."""
+        if len(self._report_cache) >= self._report_cache_size:
+            # Evict the oldest entry
+            self._report_cache.pop(next(iter(self._report_cache)), None)
+    
+    # ========================
+    # BALANCE SUMMARY
+    # ========================
+    
+    def refresh_balance_summary(self, through_date: date, refreshed_by: str) -> int:
+        """
+        Rebuild account_balance_daily from posted entries up to through_date.
+        
+        Only days closed for at least BALANCE_SUMMARY_MARGIN_DAYS (UTC) can
+        be summarized, so transactions in flight at midnight have committed
+        and later postings fall after the summary. Balance-as-of queries use
+        the summary until a transaction is reversed (which changes the
+        status of an already summarized transaction); run this again,
+        e.g. nightly, to bring it forward.
+        
+        Returns:
+            Number of (account, day) rows written
+        """
+        latest_date = datetime.now(timezone.utc).date() - timedelta(days=BALANCE_SUMMARY_MARGIN_DAYS)
+        if through_date > latest_date:
+            raise ValueError(
+                f"Balance summary must end on or before {latest_date.isoformat()} (UTC): {through_date}"
+            )
+        
+        cents = amount_in_cents()
+        posting_day = self._utc_posting_day()
+        
+        movements = select(
+                JournalEntry.account_code,
+                posting_day,
+                func.sum(case(
+                    (JournalEntry.entry_type == EntryType.DEBIT.value, cents),
+                    else_=-cents
+                ))
+            )\
+            .join(Transaction, JournalEntry.transaction_id == Transaction.transaction_id)\
+            .where(
+                Transaction.status == TransactionStatus.POSTED.value,
+                Transaction.posting_date < _utc_day_start(through_date + timedelta(days=1))
+            )\
+            .group_by(JournalEntry.account_code, posting_day)
+        
+        with self.session_factory() as session:
+            session.execute(delete(AccountBalanceDaily))
+            result = session.execute(
+                insert(AccountBalanceDaily).from_select(
+                    ['account_code', 'balance_date', 'net_debit_cents'],
+                    movements
+                )
+            )
+            
+            self.ledger._log_audit(
+                session=session,
+                event_type="BALANCE_SUMMARY_REFRESHED",
+                severity=SeverityLevel.INFO,
+                action="REFRESH_BALANCE_SUMMARY",
+                description=f"Balance summary refreshed through {through_date.isoformat()}",
+                user_id=refreshed_by,
+                source_system="REPORT_ENGINE",
+                metadata={'through_date': through_date.isoformat()}
             )
             session.commit()
+            
+            return result.rowcount
+    
+    def _utc_posting_day(self):
+        """SQL expression for the UTC calendar day of Transaction.posting_date."""
+        if self.ledger.engine.dialect.name == 'postgresql':
+            # timestamptz -> UTC wall time, independent of the session TimeZone
+            return func.date(func.timezone('UTC', Transaction.posting_date))
+        
+        # SQLite and MySQL store the UTC wall time written by the engine
+        return func.date(Transaction.posting_date)
+    
+    def _balance_summary_through(self, session: Session, as_of_date: datetime) -> Optional[date]:
+        """
+        Last summarized day usable for a balance as of as_of_date.
+        
+        Returns None if the summary was never refreshed or a transaction
+        was reversed since. Otherwise the refreshed day, capped to the day
+        before as_of_date so the partial as-of day is always read live.
+        """
+        refresh = session.execute(_LATEST_SUMMARY_REFRESH_STMT).first()
+        
+        if not refresh:
+            return None
+        
+        reversed_since = session.execute(
+            _REVERSAL_SINCE_STMT, {'since': refresh.event_timestamp}
+        ).first()
+        
+        if reversed_since:
+            return None
+        
+        through_date = date.fromisoformat(json.loads(refresh.event_metadata)['through_date'])
+        
+        if as_of_date.tzinfo:
+            as_of_date = as_of_date.astimezone(timezone.utc)
+        
+        return min(through_date, as_of_date.date() - timedelta(days=1))
+    
+    # ========================
+    # BALANCE AGGREGATION
+    # ========================
+    
+    def _query_account_balances(
+        self,
+        session: Session,
+        as_of_date: datetime,
+        start_date: Optional[datetime] = None,
+        account_types: Optional[List[AccountType]] = None,
+        include_zero_balances: bool = True
+    ) -> List[Any]:
+        """
+        Aggregate the balance of every active account in one query.
+        
+        Replaces one get_account_balance() round-trip per account. Signs
+        follow the same rules as LedgerEngine.get_account_balance():
+        - Assets & Expenses: debits - credits
+        - Liabilities, Equity & Revenue: credits - debits
+        
+        Args:
+            as_of_date: Include entries posted up to this date (inclusive)
+            start_date: If given, only entries posted after this date, i.e.
+                the movement between start_date and as_of_date
+            account_types: Restrict to these account types
+            include_zero_balances: If False, zero balances are dropped in SQL
+        
+        Balances as of a date (no start_date) read whole days from the
+        account_balance_daily summary when it is current, and aggregate
+        only the entries posted after it.
+        
+        Returns:
+            Rows of (account_code, account_name, account_type, balance_cents),
+            ordered by account_code. Balances are exact integer cents (int on
+            SQLite, Decimal on MySQL/PostgreSQL); accounts without entries
+            have balance 0.
+        """
+        # Net debit per account over posted transactions, in cents
+        cents = amount_in_cents()
+        net_debit_sum = func.sum(case(
+            (JournalEntry.entry_type == EntryType.DEBIT.value, cents),
+            else_=-cents
+        ))
+        
+        totals = session.query(
+                JournalEntry.account_code,
+                net_debit_sum.label('net_debit')
+            )\
+            .join(Transaction, JournalEntry.transaction_id == Transaction.transaction_id)\
+            .filter(
+                Transaction.status == TransactionStatus.POSTED.value,
+                Transaction.posting_date <= as_of_date
+            )
+        
+        if start_date:
+            totals = totals.filter(Transaction.posting_date > start_date)
+        
+        summary_through = None if start_date else self._balance_summary_through(session, as_of_date)
+        
+        if summary_through:
+            # Summarized days + live entries posted after them
+            totals = totals\
+                .filter(Transaction.posting_date >= _utc_day_start(summary_through + timedelta(days=1)))\
+                .group_by(JournalEntry.account_code)
+            
+            summarized = session.query(
+                    AccountBalanceDaily.account_code,
+                    func.sum(AccountBalanceDaily.net_debit_cents).label('net_debit')
+                )\
+                .filter(AccountBalanceDaily.balance_date <= summary_through)\
+                .group_by(AccountBalanceDaily.account_code)
+            
+            parts = union_all(totals.statement, summarized.statement).subquery()
+            net_debit_sum = func.sum(parts.c.net_debit)
+            
+            totals = session.query(
+                    parts.c.account_code,
+                    net_debit_sum.label('net_debit')
+                )\
+                .group_by(parts.c.account_code)
+        else:
+            totals = totals.group_by(JournalEntry.account_code)
+        
+        if not include_zero_balances:
+            totals = totals.having(net_debit_sum != 0)
+        
+        totals = totals.subquery()
+        
+        net_debit = func.coalesce(totals.c.net_debit, 0)
+        
+        balance = case(
+            (
+                ChartOfAccounts.account_type.in_(sorted(DEBIT_NORMAL_ACCOUNT_TYPES)),
+                net_debit
+            ),
+            else_=-net_debit
+        ).label('balance_cents')
+        
+        query = session.query(
+                ChartOfAccounts.account_code,
+                ChartOfAccounts.account_name,
+                ChartOfAccounts.account_type,
+                balance
+            )\
+            .join(
+                totals,
+                totals.c.account_code == ChartOfAccounts.account_code,
+                isouter=include_zero_balances
+            )\
+            .filter(ChartOfAccounts.is_active == True)
+        
+        if account_types:
+            query = query.filter(
+                ChartOfAccounts.account_type.in_([t.value for t in account_types])
+            )
+        
+        return query.order_by(ChartOfAccounts.account_code).all()
     
     # ========================
     # BALANCE SHEET
@@ -129,42 +892,47 @@ class LedgerReportEngine:
         Returns:
             Dict with balance sheet data and metadata
         """
+        cache_entry, cached = self._lookup_report_cache('BALANCE_SHEET', {
+            'as_of_date': as_of_date,
+            'generated_by': generated_by,
+            'include_zero_balances': include_zero_balances
+        })
+        if cached:
+            return cached
+        
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        as_of_iso = as_of_date.isoformat()
         
         with self.session_factory() as session:
-            # Get all accounts with balances
-            accounts = session.query(ChartOfAccounts)\
-                .filter(ChartOfAccounts.is_active == True)\
-                .order_by(ChartOfAccounts.account_code)\
-                .all()
+            # Get all accounts with balances (single aggregated query)
+            accounts = self._query_account_balances(
+                session,
+                as_of_date,
+                include_zero_balances=include_zero_balances
+            )
             
             assets = []
             liabilities = []
             equity = []
             
+            append_by_type = {
+                AccountType.ASSET.value: assets.append,
+                AccountType.LIABILITY.value: liabilities.append,
+                AccountType.EQUITY.value: equity.append
+            }
+            
             for account in accounts:
-                balance = self.ledger.get_account_balance(
-                    account.account_code,
-                    as_of_date
-                )
-                
-                if not include_zero_balances and balance == 0:
-                    continue
-                
                 account_data = {
                     'account_code': account.account_code,
                     'account_name': account.account_name,
-                    'balance': float(balance)
+                    # MySQL/PostgreSQL return SUM(BIGINT) as Decimal
+                    'balance': int(account.balance_cents) / 100
                 }
                 
-                account_type = AccountType(account.account_type)
-                
-                if account_type == AccountType.ASSET:
-                    assets.append(account_data)
-                elif account_type == AccountType.LIABILITY:
-                    liabilities.append(account_data)
-                elif account_type == AccountType.EQUITY:
-                    equity.append(account_data)
+                append = append_by_type.get(account.account_type)
+                if append:
+                    append(account_data)
             
             # Calculate totals
             total_assets = sum(a['balance'] for a in assets)
@@ -175,9 +943,10 @@ class LedgerReportEngine:
             balance_sheet = {
                 'report_id': report_id,
                 'report_type': 'BALANCE_SHEET',
+                'hash_scheme': self.hash_scheme,
                 'report_name': f'Balance Sheet as of {as_of_date.date()}',
-                'as_of_date': as_of_date.isoformat(),
-                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'as_of_date': as_of_iso,
+                'generated_at': generated_at.isoformat(),
                 'generated_by': generated_by,
                 'assets': assets,
                 'liabilities': liabilities,
@@ -199,11 +968,14 @@ class LedgerReportEngine:
                 report_id=report_id,
                 report_type='BALANCE_SHEET',
                 report_name=balance_sheet['report_name'],
-                parameters={'as_of_date': as_of_date.isoformat()},
+                parameters={'as_of_date': as_of_iso},
                 generated_by=generated_by,
-                report_hash=report_hash
+                report_hash=report_hash,
+                generated_at=generated_at,
+                session=session
             )
             
+            self._store_report_cache(cache_entry, balance_sheet, {'as_of_date': as_of_iso})
             return balance_sheet
     
     # ========================
@@ -228,54 +1000,47 @@ class LedgerReportEngine:
         Returns:
             Dict with income statement data and metadata
         """
+        cache_entry, cached = self._lookup_report_cache('INCOME_STATEMENT', {
+            'start_date': start_date,
+            'end_date': end_date,
+            'generated_by': generated_by,
+            'include_zero_balances': include_zero_balances
+        })
+        if cached:
+            return cached
+        
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        start_iso = start_date.isoformat()
+        end_iso = end_date.isoformat()
         
         with self.session_factory() as session:
-            # Get revenue and expense accounts
-            accounts = session.query(ChartOfAccounts)\
-                .filter(
-                    ChartOfAccounts.is_active == True,
-                    ChartOfAccounts.account_type.in_([
-                        AccountType.REVENUE.value,
-                        AccountType.EXPENSE.value
-                    ])
-                )\
-                .order_by(ChartOfAccounts.account_code)\
-                .all()
+            # Movement of revenue and expense accounts in the period
+            accounts = self._query_account_balances(
+                session,
+                end_date,
+                start_date=start_date,
+                account_types=[AccountType.REVENUE, AccountType.EXPENSE],
+                include_zero_balances=include_zero_balances
+            )
             
             revenues = []
             expenses = []
             
+            append_by_type = {
+                AccountType.REVENUE.value: revenues.append,
+                AccountType.EXPENSE.value: expenses.append
+            }
+            
             for account in accounts:
-                # Get transactions in period
-                balance = self.ledger.get_account_balance(
-                    account.account_code,
-                    end_date
-                )
-                
-                # Get balance at start of period
-                start_balance = self.ledger.get_account_balance(
-                    account.account_code,
-                    start_date
-                )
-                
-                period_balance = balance - start_balance
-                
-                if not include_zero_balances and period_balance == 0:
-                    continue
-                
                 account_data = {
                     'account_code': account.account_code,
                     'account_name': account.account_name,
-                    'balance': float(abs(period_balance))
+                    # MySQL/PostgreSQL return SUM(BIGINT) as Decimal
+                    'balance': abs(int(account.balance_cents)) / 100
                 }
                 
-                account_type = AccountType(account.account_type)
-                
-                if account_type == AccountType.REVENUE:
-                    revenues.append(account_data)
-                elif account_type == AccountType.EXPENSE:
-                    expenses.append(account_data)
+                append_by_type[account.account_type](account_data)
             
             # Calculate totals
             total_revenue = sum(r['balance'] for r in revenues)
@@ -286,10 +1051,11 @@ class LedgerReportEngine:
             income_statement = {
                 'report_id': report_id,
                 'report_type': 'INCOME_STATEMENT',
+                'hash_scheme': self.hash_scheme,
                 'report_name': f'Income Statement {start_date.date()} to {end_date.date()}',
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'start_date': start_iso,
+                'end_date': end_iso,
+                'generated_at': generated_at.isoformat(),
                 'generated_by': generated_by,
                 'revenues': revenues,
                 'expenses': expenses,
@@ -310,13 +1076,19 @@ class LedgerReportEngine:
                 report_type='INCOME_STATEMENT',
                 report_name=income_statement['report_name'],
                 parameters={
-                    'start_date': start_date.isoformat(),
-                    'end_date': end_date.isoformat()
+                    'start_date': start_iso,
+                    'end_date': end_iso
                 },
                 generated_by=generated_by,
-                report_hash=report_hash
+                report_hash=report_hash,
+                generated_at=generated_at,
+                session=session
             )
             
+            self._store_report_cache(cache_entry, income_statement, {
+                'start_date': start_iso,
+                'end_date': end_iso
+            })
             return income_statement
     
     # ========================
@@ -335,39 +1107,46 @@ class LedgerReportEngine:
         Returns:
             Dict with trial balance data and metadata
         """
+        cache_entry, cached = self._lookup_report_cache('TRIAL_BALANCE', {
+            'as_of_date': as_of_date,
+            'generated_by': generated_by,
+            'include_zero_balances': include_zero_balances
+        })
+        if cached:
+            return cached
+        
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        as_of_iso = as_of_date.isoformat()
         
-        # Get trial balance
-        trial_balance = self.ledger.get_trial_balance(as_of_date)
+        # Cast balances to float (JSON serialization), filter zero balances
+        # if requested and accumulate totals in a single pass
+        trial_balance = []
+        total_debits = 0.0
+        total_credits = 0.0
         
-        # Filter zero balances if requested
-        if not include_zero_balances:
-            trial_balance = [
-                account for account in trial_balance
-                if account['balance'] != Decimal('0')
-            ]
-        
-        # Calculate totals
-        total_debits = sum(
-            abs(float(a['balance'])) for a in trial_balance
-            if a['balance'] > 0
-        )
-        total_credits = sum(
-            abs(float(a['balance'])) for a in trial_balance
-            if a['balance'] < 0
-        )
-        
-        # Convert Decimal to float for JSON serialization
-        for account in trial_balance:
-            account['balance'] = float(account['balance'])
+        for account in self.ledger.get_trial_balance(as_of_date):
+            balance = float(account['balance'])
+            
+            if not include_zero_balances and balance == 0:
+                continue
+            
+            account['balance'] = balance
+            trial_balance.append(account)
+            
+            if balance > 0:
+                total_debits += balance
+            else:
+                total_credits -= balance
         
         # Build report
         trial_balance_report = {
             'report_id': report_id,
             'report_type': 'TRIAL_BALANCE',
+            'hash_scheme': self.hash_scheme,
             'report_name': f'Trial Balance as of {as_of_date.date()}',
-            'as_of_date': as_of_date.isoformat(),
-            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'as_of_date': as_of_iso,
+            'generated_at': generated_at.isoformat(),
             'generated_by': generated_by,
             'accounts': trial_balance,
             'totals': {
@@ -386,11 +1165,13 @@ class LedgerReportEngine:
             report_id=report_id,
             report_type='TRIAL_BALANCE',
             report_name=trial_balance_report['report_name'],
-            parameters={'as_of_date': as_of_date.isoformat()},
+            parameters={'as_of_date': as_of_iso},
             generated_by=generated_by,
-            report_hash=report_hash
+            report_hash=report_hash,
+            generated_at=generated_at
         )
         
+        self._store_report_cache(cache_entry, trial_balance_report, {'as_of_date': as_of_iso})
         return trial_balance_report
     
     # ========================
@@ -408,6 +1189,7 @@ class LedgerReportEngine:
             Dict with integrity verification data
         """
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
         
         with self.session_factory() as session:
             # Verify double-entry integrity
@@ -422,8 +1204,9 @@ class LedgerReportEngine:
             integrity_report = {
                 'report_id': report_id,
                 'report_type': 'INTEGRITY_VERIFICATION',
+                'hash_scheme': self.hash_scheme,
                 'report_name': 'Integrity Verification Report',
-                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'generated_at': generated_at.isoformat(),
                 'generated_by': generated_by,
                 'is_valid': is_valid,
                 'total_transactions': total_transactions,
@@ -442,7 +1225,9 @@ class LedgerReportEngine:
                 report_name=integrity_report['report_name'],
                 parameters={},
                 generated_by=generated_by,
-                report_hash=report_hash
+                report_hash=report_hash,
+                generated_at=generated_at,
+                session=session
             )
             
             return integrity_report
@@ -451,6 +1236,61 @@ class LedgerReportEngine:
     # GENERAL LEDGER
     # ========================
     
+    def _general_ledger_query(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+        account_code: Optional[str] = None
+    ):
+        """Build the general ledger query, streamed in chunks of GL_CHUNK_SIZE rows."""
+        query = session.query(
+            Transaction.transaction_number,
+            Transaction.transaction_date,
+            Transaction.description,
+            JournalEntry.account_code,
+            ChartOfAccounts.account_name,
+            JournalEntry.entry_type,
+            JournalEntry.amount,
+            JournalEntry.memo
+        )\
+        .join(JournalEntry, Transaction.transaction_id == JournalEntry.transaction_id)\
+        .join(ChartOfAccounts, JournalEntry.account_id == ChartOfAccounts.account_id)\
+        .filter(
+            Transaction.status == TransactionStatus.POSTED.value,
+            Transaction.posting_date >= start_date,
+            Transaction.posting_date <= end_date
+        )\
+        .order_by(
+            Transaction.transaction_date,
+            Transaction.transaction_number,
+            JournalEntry.entry_number
+        )
+        
+        if account_code:
+            query = query.filter(JournalEntry.account_code == account_code)
+        
+        # Server-side cursor where the driver supports it; rows are fetched
+        # GL_CHUNK_SIZE at a time instead of all at once
+        return query.execution_options(stream_results=True).yield_per(GL_CHUNK_SIZE)
+    
+    @staticmethod
+    def _general_ledger_entry(row) -> Dict[str, Any]:
+        """Format a general ledger row."""
+        (transaction_number, transaction_date, description, account_code,
+         account_name, entry_type, amount, memo) = row
+        
+        return {
+            'transaction_number': transaction_number,
+            'transaction_date': transaction_date.isoformat() if transaction_date else None,
+            'description': description,
+            'account_code': account_code,
+            'account_name': account_name,
+            'entry_type': entry_type,
+            'amount': float(amount),
+            'memo': memo
+        }
+    
     def generate_general_ledger(
         self,
         start_date: datetime,
@@ -461,65 +1301,33 @@ class LedgerReportEngine:
         """
         Generate General Ledger Report (Razão Geral).
         
+        For very large periods use export_general_ledger(), which writes
+        entries straight to disk instead of holding them in memory.
+        
         Returns:
             Dict with general ledger data
         """
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        start_iso = start_date.isoformat()
+        end_iso = end_date.isoformat()
         
         with self.session_factory() as session:
-            # Build query
-            query = session.query(
-                Transaction.transaction_number,
-                Transaction.transaction_date,
-                Transaction.description,
-                JournalEntry.account_code,
-                ChartOfAccounts.account_name,
-                JournalEntry.entry_type,
-                JournalEntry.amount,
-                JournalEntry.memo
-            )\
-            .join(JournalEntry, Transaction.transaction_id == JournalEntry.transaction_id)\
-            .join(ChartOfAccounts, JournalEntry.account_id == ChartOfAccounts.account_id)\
-            .filter(
-                Transaction.status == TransactionStatus.POSTED.value,
-                Transaction.posting_date >= start_date,
-                Transaction.posting_date <= end_date
-            )\
-            .order_by(
-                Transaction.transaction_date,
-                Transaction.transaction_number,
-                JournalEntry.entry_number
-            )
-            
-            if account_code:
-                query = query.filter(JournalEntry.account_code == account_code)
-            
-            # Execute query
-            results = query.all()
+            query = self._general_ledger_query(session, start_date, end_date, account_code)
             
             # Format results
-            entries = []
-            for row in results:
-                entries.append({
-                    'transaction_number': row[0],
-                    'transaction_date': row[1].isoformat() if row[1] else None,
-                    'description': row[2],
-                    'account_code': row[3],
-                    'account_name': row[4],
-                    'entry_type': row[5],
-                    'amount': float(row[6]),
-                    'memo': row[7]
-                })
+            entries = [self._general_ledger_entry(row) for row in query]
             
             # Build report
             general_ledger = {
                 'report_id': report_id,
                 'report_type': 'GENERAL_LEDGER',
+                'hash_scheme': self.hash_scheme,
                 'report_name': f'General Ledger {start_date.date()} to {end_date.date()}',
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
+                'start_date': start_iso,
+                'end_date': end_iso,
                 'account_filter': account_code,
-                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'generated_at': generated_at.isoformat(),
                 'generated_by': generated_by,
                 'entries': entries,
                 'entry_count': len(entries)
@@ -535,16 +1343,106 @@ class LedgerReportEngine:
                 report_type='GENERAL_LEDGER',
                 report_name=general_ledger['report_name'],
                 parameters={
-                    'start_date': start_date.isoformat(),
-                    'end_date': end_date.isoformat(),
+                    'start_date': start_iso,
+                    'end_date': end_iso,
                     'account_code': account_code
                 },
                 generated_by=generated_by,
-                report_hash=report_hash
+                report_hash=report_hash,
+                generated_at=generated_at,
+                session=session
             )
             
             return general_ledger
     
+    def export_general_ledger(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        generated_by: str,
+        filename: str,
+        account_code: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the General Ledger directly into a JSON file.
+        
+        Entries are streamed from the database to the file while the report
+        hash is updated incrementally, so memory use is bounded by
+        GL_CHUNK_SIZE instead of the number of entries. The file holds the
+        same report generate_general_ledger() would return and passes
+        verify_report_integrity() once loaded.
+        
+        Returns:
+            Report header (without entries) including entry_count,
+            report_hash and output_file
+        """
+        report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        start_iso = start_date.isoformat()
+        end_iso = end_date.isoformat()
+        
+        header = {
+            'report_id': report_id,
+            'report_type': 'GENERAL_LEDGER',
+            # Hashed while streaming, which only canonical JSON schemes support
+            'hash_scheme': HASH_SCHEME_BLAKE3 if self.hash_scheme == HASH_SCHEME_BLAKE3 else HASH_SCHEME,
+            'report_name': f'General Ledger {start_date.date()} to {end_date.date()}',
+            'start_date': start_iso,
+            'end_date': end_iso,
+            'account_filter': account_code,
+            'generated_at': generated_at.isoformat(),
+            'generated_by': generated_by
+        }
+        
+        hasher = self._canonical_hasher(header['hash_scheme'])
+        entry_count = 0
+        
+        with self.session_factory() as session, open(filename, 'wb') as f:
+            query = self._general_ledger_query(session, start_date, end_date, account_code)
+            
+            def entries():
+                nonlocal entry_count
+                for row in query:
+                    entry_count += 1
+                    yield self._general_ledger_entry(row)
+            
+            # entry_count is serialized after entries, once they are consumed
+            report_body = dict(header, entries=entries())
+            late_members = {'entry_count': lambda: entry_count}
+            
+            f.write(b'{')
+            hasher.update(b'{')
+            
+            for chunk in self._iter_canonical_members(report_body, late_members=late_members):
+                f.write(chunk)
+                hasher.update(chunk)
+            
+            hasher.update(b'}')
+            report_hash = hasher.hexdigest()
+            
+            # The hash is stored in the file but is not part of the hashed content
+            f.write(b',' + _canonical_json('report_hash') + b':' + _canonical_json(report_hash) + b'}')
+        
+        header['entry_count'] = entry_count
+        header['report_hash'] = report_hash
+        header['output_file'] = filename
+        
+        self._save_report_metadata(
+            report_id=report_id,
+            report_type='GENERAL_LEDGER',
+            report_name=header['report_name'],
+            parameters={
+                'start_date': start_iso,
+                'end_date': end_iso,
+                'account_code': account_code
+            },
+            generated_by=generated_by,
+            report_hash=report_hash,
+            generated_at=generated_at
+        )
+        
+        return header
+    
     # ========================
     # AUDIT REPORT
     # ========================
@@ -564,50 +1462,58 @@ class LedgerReportEngine:
             Dict with audit trail data and metadata
         """
         report_id = self._generate_report_id()
+        generated_at = datetime.now(timezone.utc)
+        start_iso = start_date.isoformat()
+        end_iso = end_date.isoformat()
         
         with self.session_factory() as session:
-            # Build query
-            query = session.query(AuditLog)\
-                .filter(
+            # Core select of the reported columns: no ORM objects are built
+            stmt = select(
+                AuditLog.audit_id,
+                AuditLog.event_timestamp,
+                AuditLog.event_type,
+                AuditLog.severity,
+                AuditLog.user_id,
+                AuditLog.source_system,
+                AuditLog.action,
+                AuditLog.description,
+                AuditLog.transaction_id
+            )\
+                .where(
                     AuditLog.event_timestamp >= start_date,
                     AuditLog.event_timestamp <= end_date
                 )\
                 .order_by(AuditLog.event_timestamp.desc())
             
             if event_type:
-                query = query.filter(AuditLog.event_type == event_type)
+                stmt = stmt.where(AuditLog.event_type == event_type)
             
             if user_filter:
-                query = query.filter(AuditLog.user_id == user_filter)
+                stmt = stmt.where(AuditLog.user_id == user_filter)
             
-            # Execute query
-            audit_logs = query.all()
+            # Server-side cursor where the driver supports it
+            rows = session.execute(
+                stmt.execution_options(stream_results=True, yield_per=GL_CHUNK_SIZE)
+            )
             
             # Format results
             entries = []
-            for log in audit_logs:
-                entries.append({
-                    'audit_id': log.audit_id,
-                    'event_timestamp': log.event_timestamp.isoformat(),
-                    'event_type': log.event_type,
-                    'severity': log.severity,
-                    'user_id': log.user_id,
-                    'source_system': log.source_system,
-                    'action': log.action,
-                    'description': log.description,
-                    'transaction_id': log.transaction_id
-                })
+            for row in rows:
+                entry = row._asdict()
+                entry['event_timestamp'] = entry['event_timestamp'].isoformat()
+                entries.append(entry)
             
             # Build report
             audit_trail = {
                 'report_id': report_id,
                 'report_type': 'AUDIT_TRAIL',
+                'hash_scheme': self.hash_scheme,
                 'report_name': f'Audit Trail {start_date.date()} to {end_date.date()}',
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
+                'start_date': start_iso,
+                'end_date': end_iso,
                 'event_type_filter': event_type,
                 'user_filter': user_filter,
-                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'generated_at': generated_at.isoformat(),
                 'generated_by': generated_by,
                 'entries': entries,
                 'entry_count': len(entries)
@@ -623,26 +1529,154 @@ class LedgerReportEngine:
                 report_type='AUDIT_TRAIL',
                 report_name=audit_trail['report_name'],
                 parameters={
-                    'start_date': start_date.isoformat(),
-                    'end_date': end_date.isoformat(),
+                    'start_date': start_iso,
+                    'end_date': end_iso,
                     'event_type': event_type,
                     'user_filter': user_filter
                 },
                 generated_by=generated_by,
-                report_hash=report_hash
+                report_hash=report_hash,
+                generated_at=generated_at,
+                session=session
             )
             
             return audit_trail
     
+    # ========================
+    # BATCH GENERATION
+    # ========================
+    
+    def generate_all(
+        self,
+        as_of_date: datetime,
+        start_date: datetime,
+        end_date: datetime,
+        generated_by: str,
+        max_workers: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate the period-end report set concurrently.
+        
+        Balance sheet, income statement, trial balance and general ledger
+        are independent and dominated by database I/O, so they run in a
+        thread pool. Each report opens its own session from the shared
+        connection pool; keep the pool size >= max_workers.
+        
+        Returns:
+            Dict keyed by report name with each generated report
+        """
+        # Generate in the calling thread when threads cannot share the database
+        if self._single_connection():
+            return {
+                'balance_sheet': self.generate_balance_sheet(as_of_date, generated_by),
+                'income_statement': self.generate_income_statement(
+                    start_date, end_date, generated_by
+                ),
+                'trial_balance': self.generate_trial_balance_report(as_of_date, generated_by),
+                'general_ledger': self.generate_general_ledger(
+                    start_date, end_date, generated_by
+                ),
+            }
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                'balance_sheet': pool.submit(
+                    self.generate_balance_sheet, as_of_date, generated_by
+                ),
+                'income_statement': pool.submit(
+                    self.generate_income_statement, start_date, end_date, generated_by
+                ),
+                'trial_balance': pool.submit(
+                    self.generate_trial_balance_report, as_of_date, generated_by
+                ),
+                'general_ledger': pool.submit(
+                    self.generate_general_ledger, start_date, end_date, generated_by
+                ),
+            }
+            
+            return {name: future.result() for name, future in futures.items()}
+    
     # ========================
     # EXPORT FUNCTIONS
     # ========================
     
     def export_to_json(self, report: Dict[str, Any], filename: str):
         """Export report to JSON file."""
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            return
+        
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
     
+    def export_to_store(self, report: Dict[str, Any], directory: str) -> str:
+        """
+        Export report to JSON under its own hash: {directory}/{report_hash}.json.
+        
+        The file is written to a temporary name and renamed into place, so
+        a file at the content-addressed path is always complete. Such a file
+        can be checked with verify_report_integrity(report, path=..., deep=False).
+        
+        Returns:
+            Path of the stored report
+        """
+        report_hash = report.get('report_hash')
+        if not report_hash:
+            raise ValueError("Report has no report_hash")
+        
+        path = os.path.join(directory, f"{report_hash}.json")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        
+        try:
+            self.export_to_json(report, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        return path
+    
+    def export_general_ledger_csv(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filename: str,
+        account_code: Optional[str] = None
+    ) -> int:
+        """
+        Export general ledger entries straight from the database to CSV.
+        
+        Same columns as export_to_csv() on a general ledger report, but rows
+        are read with pandas.read_sql in chunks of GL_CHUNK_SIZE and appended
+        to the file, so no report or entry list is built in memory.
+        
+        Returns:
+            Number of entries written
+        """
+        with self.session_factory() as session:
+            statement = self._general_ledger_query(session, start_date, end_date, account_code).statement
+        
+        entry_count = 0
+        
+        with self.ledger.engine.connect() as connection:
+            chunks = pd.read_sql(statement, connection, chunksize=GL_CHUNK_SIZE)
+            
+            for index, chunk in enumerate(chunks):
+                chunk['transaction_date'] = chunk['transaction_date'].map(
+                    lambda value: value.isoformat() if pd.notna(value) else None
+                )
+                chunk['amount'] = chunk['amount'].astype(float)
+                chunk.to_csv(filename, index=False, header=index == 0, mode='w' if index == 0 else 'a')
+                entry_count += len(chunk)
+        
+        if entry_count == 0:
+            # No rows: write the header only
+            pd.DataFrame(columns=list(statement.selected_columns.keys())).to_csv(filename, index=False)
+        
+        return entry_count
+    
     def export_to_csv(self, report: Dict[str, Any], filename: str):
         """Export report to CSV file."""
         # Determine what data to export based on report type
@@ -653,34 +1687,44 @@ class LedgerReportEngine:
             data = []
             for section in ['assets', 'liabilities', 'equity']:
                 for item in report.get(section, []):
-                    item['section'] = section
-                    data.append(item)
-            df = pd.DataFrame(data)
+                    data.append(dict(item, section=section))
         
         elif report_type == 'INCOME_STATEMENT':
             # Combine revenues and expenses
             data = []
             for item in report.get('revenues', []):
-                item['type'] = 'revenue'
-                data.append(item)
+                data.append(dict(item, type='revenue'))
             for item in report.get('expenses', []):
-                item['type'] = 'expense'
-                data.append(item)
-            df = pd.DataFrame(data)
+                data.append(dict(item, type='expense'))
         
         elif report_type in ['TRIAL_BALANCE', 'GENERAL_LEDGER', 'AUDIT_TRAIL']:
             # Direct conversion
-            df = pd.DataFrame(report.get('accounts' if report_type == 'TRIAL_BALANCE' else 'entries', []))
+            data = report.get('accounts' if report_type == 'TRIAL_BALANCE' else 'entries', [])
         
         else:
             raise ValueError(f"Unknown report type: {report_type}")
         
-        df.to_csv(filename, index=False)
+        # Rows are written as they are; no DataFrame is built
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            if data:
+                writer = csv.DictWriter(f, fieldnames=list(data[0]), lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(data)
     
-    def verify_report_integrity(self, report: Dict[str, Any]) -> bool:
+    def verify_report_integrity(
+        self,
+        report: Dict[str, Any],
+        *,
+        path: Optional[str] = None,
+        deep: bool = True
+    ) -> bool:
         """
         Verify report integrity by recalculating hash.
         
+        With deep=False, only checks that the report was loaded from its
+        content-addressed path (see export_to_store()), i.e. that the file
+        name matches report_hash, without rehashing the content.
+        
         Returns:
             True if hash matches, False otherwise
         """
@@ -688,13 +1732,100 @@ class LedgerReportEngine:
         if not stored_hash:
             return False
         
-        # Remove hash for recalculation
-        report_copy = report.copy()
-        report_copy.pop('report_hash', None)
+        if not deep:
+            if path is None:
+                raise ValueError("Shallow verification requires the report's path")
+            return os.path.basename(path) == f"{stored_hash}.json"
         
-        calculated_hash = self._calculate_report_hash(report_copy)
+        # Recalculate without the stored hash
+        calculated_hash = self._calculate_report_hash(report, skip_keys=('report_hash',))
         
         return stored_hash == calculated_hash
+    
+    def _general_ledger_source_digest(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        account_code: Optional[str] = None
+    ) -> str:
+        """
+        SHA-256 of the posted journal entries a general ledger covers.
+        
+        Rows are formatted 'transaction_number|account_code|entry_type|cents'
+        and joined with newlines in general ledger order. PostgreSQL computes
+        the digest server-side, so no rows cross the wire; other backends
+        stream the rows and hash them here.
+        """
+        line = func.concat_ws(
+            '|',
+            Transaction.transaction_number,
+            JournalEntry.account_code,
+            JournalEntry.entry_type,
+            amount_in_cents()
+        )
+        order = (Transaction.transaction_date, Transaction.transaction_number, JournalEntry.entry_number)
+        
+        with self.session_factory() as session:
+            if self.ledger.engine.dialect.name == 'postgresql':
+                lines = func.string_agg(line, aggregate_order_by(literal_column("E'\\n'"), *order))
+                query = session.query(
+                    func.encode(func.sha256(func.convert_to(func.coalesce(lines, ''), 'UTF8')), 'hex')
+                )
+            else:
+                query = session.query(
+                    Transaction.transaction_number,
+                    JournalEntry.account_code,
+                    JournalEntry.entry_type,
+                    amount_in_cents()
+                )
+            
+            query = query\
+                .join(JournalEntry, Transaction.transaction_id == JournalEntry.transaction_id)\
+                .filter(
+                    Transaction.status == TransactionStatus.POSTED.value,
+                    Transaction.posting_date >= start_date,
+                    Transaction.posting_date <= end_date
+                )
+            
+            if account_code:
+                query = query.filter(JournalEntry.account_code == account_code)
+            
+            if self.ledger.engine.dialect.name == 'postgresql':
+                return query.scalar()
+            
+            rows = query.order_by(*order)\
+                .execution_options(stream_results=True)\
+                .yield_per(GL_CHUNK_SIZE)
+            
+            return _digest_lines('|'.join(str(value) for value in row) for row in rows)
+    
+    def verify_general_ledger_source(self, report: Dict[str, Any]) -> bool:
+        """
+        Check a general ledger report's entries against the database.
+        
+        Unlike verify_report_integrity(), which detects changes to the
+        report itself, this detects entries that no longer match the posted
+        journal. The database side is digested by
+        _general_ledger_source_digest() without loading the entries.
+        
+        Returns:
+            True if the report's entries match the ledger, False otherwise
+        """
+        if report.get('report_type') != 'GENERAL_LEDGER':
+            raise ValueError(f"Not a general ledger report: {report.get('report_type')}")
+        
+        report_digest = _digest_lines(
+            f"{e['transaction_number']}|{e['account_code']}|{e['entry_type']}|{round(e['amount'] * 100)}"
+            for e in report.get('entries', [])
+        )
+        
+        source_digest = self._general_ledger_source_digest(
+            datetime.fromisoformat(report['start_date']),
+            datetime.fromisoformat(report['end_date']),
+            report.get('account_filter')
+        )
+        
+        return report_digest == source_digest
 
 
 def main():
@@ -14,14 +14,62 @@ This script will:
 
 Usage:
     python -m src.setup
+    python -m src.setup --yes                 # non-interactive (CI)
+    python -m src.setup --yes --skip-venv     # use the current environment
+    python -m src.setup --skip-accounts       # no sample chart of accounts
 """
 
 import os
+import argparse
+import re
 import sys
 import subprocess
 from pathlib import Path
 
 
+# Concurrent pip processes for the first (download-bound) install pass
+PIP_WORKERS = 4
+
+# Left to the final pass: upgrading pip while other pip processes run is unsafe
+PIP_TOOLING = {"pip", "setuptools", "wheel"}
+
+# Answer every confirmation prompt with yes (--yes)
+AUTO_YES = False
+
+# Set for the restarted (in-venv) run once the .env step has run
+ENV_FILE_DONE = "LEDGER_SETUP_ENV_FILE_DONE"
+
+# Parsed .env files: (path, mtime in ns) -> variables
+_DOTENV_CACHE = {}
+
+# Sample chart of accounts: (code, name, AccountType value, parent code).
+# Types are kept as strings so importing this script does not load the engine.
+SAMPLE_ACCOUNTS = (
+    # Assets
+    ("1000", "ATIVOS", "ASSET", None),
+    ("1100", "Caixa e Bancos", "ASSET", "1000"),
+    ("1200", "Contas a Receber", "ASSET", "1000"),
+    
+    # Liabilities
+    ("2000", "PASSIVOS", "LIABILITY", None),
+    ("2100", "Contas a Pagar", "LIABILITY", "2000"),
+    ("2200", "Empréstimos", "LIABILITY", "2000"),
+    
+    # Equity
+    ("3000", "PATRIMÔNIO LÍQUIDO", "EQUITY", None),
+    ("3100", "Capital Social", "EQUITY", "3000"),
+    
+    # Revenue
+    ("4000", "RECEITAS", "REVENUE", None),
+    ("4100", "Receitas de Vendas", "REVENUE", "4000"),
+    
+    # Expenses
+    ("5000", "DESPESAS", "EXPENSE", None),
+    ("5100", "Custos de Vendas", "EXPENSE", "5000"),
+    ("5200", "Despesas Administrativas", "EXPENSE", "5000"),
+)
+
+
 def print_header(message):
     """Print formatted header."""
     print("\n" + "=" * 80)
@@ -29,6 +77,15 @@ def print_header(message):
     print("=" * 80 + "\n")
 
 
+def confirm(prompt):
+    """Ask a y/n question; always yes with --yes."""
+    if AUTO_YES:
+        print(f"{prompt}y")
+        return True
+    
+    return input(prompt).strip().lower() == 'y'
+
+
 def check_python_version():
     """Check if Python version is adequate."""
     print_header("Checking Python Version")
@@ -44,43 +101,128 @@ def check_python_version():
 
 
 def create_venv():
-    """Create virtual environment."""
+    """
+    Start creating the virtual environment.
+    
+    Returns:
+        The running venv process (pass it to wait_for_venv()), or None if
+        the existing venv is kept
+    """
     print_header("Creating Virtual Environment")
     
     venv_path = Path("env")
     
     if venv_path.exists():
         print("⚠️  Virtual environment already exists")
-        response = input("Recreate? (y/n): ").strip().lower()
-        if response != 'y':
+        if not confirm("Recreate? (y/n): "):
             print("Skipping venv creation")
-            return
+            return None
         
+        # Locked leftovers (Windows) are fine: venv reuses the directory
         import shutil
-        shutil.rmtree(venv_path)
+        shutil.rmtree(venv_path, ignore_errors=True)
     
     print("Creating virtual environment...")
-    subprocess.run([sys.executable, "-m", "venv", "env"], check=True)
+    return subprocess.Popen([sys.executable, "-m", "venv", "env"])
+
+
+def wait_for_venv(process):
+    """Wait for a venv process started by create_venv()."""
+    if process is None:
+        return
+    
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+    
     print("✅ Virtual environment created")
 
 
-def install_dependencies():
-    """Install Python dependencies."""
-    print_header("Installing Dependencies")
+def read_requirements(path="requirements.txt"):
+    """Return the requirement specifiers of a requirements file."""
+    requirements = []
+    
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        
+        # Skip blanks and pip options (-r, -e, --index-url, ...)
+        if line and not line.startswith("-"):
+            requirements.append(line)
     
-    # Determine pip path
+    return requirements
+
+
+def in_project_venv():
+    """Check if this interpreter runs from the project's env virtual environment."""
+    return Path(sys.prefix).resolve() == Path("env").resolve()
+
+
+def restart_in_venv():
+    """Replace this process with the setup script run by the venv interpreter."""
     if sys.platform == "win32":
-        pip_path = Path("env/Scripts/pip")
+        python_path = Path("env/Scripts/python.exe")
     else:
-        pip_path = Path("env/bin/pip")
+        python_path = Path("env/bin/python")
     
-    if not pip_path.exists():
-        print("❌ Error: Virtual environment not found")
-        print("   Please activate virtual environment first")
-        sys.exit(1)
+    if not python_path.exists():
+        return
+    
+    # Same entry point as this run: `python -m src.setup` or the script path
+    if __spec__ and __spec__.name:
+        command = [str(python_path), "-m", __spec__.name, *sys.argv[1:]]
+    else:
+        command = [str(python_path), str(Path(__file__).resolve()), *sys.argv[1:]]
+    
+    print("Restarting setup inside the virtual environment...")
+    sys.stdout.flush()
     
-    print("Installing requirements...")
-    subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
+    if sys.platform == "win32":
+        # execv on Windows spawns a detached child; wait for it instead
+        sys.exit(subprocess.call(command))
+    
+    os.execv(command[0], command)
+
+
+def install_dependencies(use_venv=True):
+    """Install Python dependencies (into the running interpreter if not use_venv)."""
+    print_header("Installing Dependencies")
+    
+    if use_venv:
+        # Determine pip path
+        if sys.platform == "win32":
+            pip_path = Path("env/Scripts/pip")
+        else:
+            pip_path = Path("env/bin/pip")
+        
+        if not pip_path.exists():
+            print("❌ Error: Virtual environment not found")
+            print("   Please activate virtual environment first")
+            sys.exit(1)
+        
+        pip = [str(pip_path)]
+    else:
+        pip = [sys.executable, "-m", "pip"]
+    
+    requirements = [
+        requirement for requirement in read_requirements()
+        if re.split(r"[\s\[<>=!~;]", requirement, maxsplit=1)[0].lower() not in PIP_TOOLING
+    ]
+    
+    # First pass: top-level packages are independent, so fetch and install
+    # them in parallel. --no-deps keeps each process to its own packages.
+    print(f"Installing requirements ({PIP_WORKERS} parallel pip processes)...")
+    processes = [
+        subprocess.Popen([*pip, "install", "--quiet", "--no-deps", *group])
+        for group in (requirements[i::PIP_WORKERS] for i in range(PIP_WORKERS))
+        if group
+    ]
+    
+    # Wait for every process before the final pass touches the same venv
+    if any([process.wait() != 0 for process in processes]):
+        print("⚠️  Some packages failed in the parallel pass; retrying below")
+    
+    # Final pass: resolve transitive dependencies and version conflicts
+    print("Resolving dependencies...")
+    subprocess.run([*pip, "install", "-r", "requirements.txt"], check=True)
     print("✅ Dependencies installed")
 
 
@@ -92,8 +234,7 @@ def create_env_file():
     
     if env_file.exists():
         print("⚠️  .env file already exists")
-        response = input("Overwrite? (y/n): ").strip().lower()
-        if response != 'y':
+        if not confirm("Overwrite? (y/n): "):
             print("Skipping .env creation")
             return
     
@@ -103,21 +244,44 @@ def create_env_file():
         print("❌ Error: .env.template not found")
         sys.exit(1)
     
-    # Copy template
+    # Copy template (contents only; zero-copy sendfile where available).
+    # Not a hardlink: credentials written to .env would land in the tracked template.
     import shutil
-    shutil.copy(template_file, env_file)
+    shutil.copyfile(template_file, env_file)
     
     print("✅ .env file created")
     print("\n⚠️  IMPORTANT: Edit .env file with your database credentials!")
     print("   Required: LEDGER_DB_URI")
 
 
+def load_env_file(path=".env"):
+    """
+    Load variables from a .env file into os.environ (existing ones win).
+    
+    The file is parsed once per modification; later calls reuse the
+    parsed values.
+    """
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return
+    
+    if key not in _DOTENV_CACHE:
+        from dotenv import dotenv_values
+        _DOTENV_CACHE[key] = {
+            name: value for name, value in dotenv_values(path).items()
+            if value is not None
+        }
+    
+    for name, value in _DOTENV_CACHE[key].items():
+        os.environ.setdefault(name, value)
+
+
 def check_database_config():
     """Check if database is configured."""
     print_header("Checking Database Configuration")
     
-    from dotenv import load_dotenv
-    load_dotenv()
+    load_env_file()
     
     db_uri = os.getenv('LEDGER_DB_URI')
     
@@ -140,8 +304,7 @@ def initialize_database():
         print("Please configure database and run: python ledger_admin_cli.py init --confirm")
         return
     
-    response = input("Initialize database now? (y/n): ").strip().lower()
-    if response != 'y':
+    if not confirm("Initialize database now? (y/n): "):
         print("Skipping database initialization")
         return
     
@@ -162,8 +325,7 @@ def create_sample_accounts():
     """Create sample chart of accounts."""
     print_header("Creating Sample Chart of Accounts")
     
-    response = input("Create sample accounts? (y/n): ").strip().lower()
-    if response != 'y':
+    if not confirm("Create sample accounts? (y/n): "):
         print("Skipping sample accounts creation")
         return
     
@@ -172,43 +334,23 @@ def create_sample_accounts():
         
         ledger = LedgerEngine()
         
-        sample_accounts = [
-            # Assets
-            ("1000", "ATIVOS", AccountType.ASSET, None),
-            ("1100", "Caixa e Bancos", AccountType.ASSET, "1000"),
-            ("1200", "Contas a Receber", AccountType.ASSET, "1000"),
-            
-            # Liabilities
-            ("2000", "PASSIVOS", AccountType.LIABILITY, None),
-            ("2100", "Contas a Pagar", AccountType.LIABILITY, "2000"),
-            ("2200", "Empréstimos", AccountType.LIABILITY, "2000"),
-            
-            # Equity
-            ("3000", "PATRIMÔNIO LÍQUIDO", AccountType.EQUITY, None),
-            ("3100", "Capital Social", AccountType.EQUITY, "3000"),
-            
-            # Revenue
-            ("4000", "RECEITAS", AccountType.REVENUE, None),
-            ("4100", "Receitas de Vendas", AccountType.REVENUE, "4000"),
-            
-            # Expenses
-            ("5000", "DESPESAS", AccountType.EXPENSE, None),
-            ("5100", "Custos de Vendas", AccountType.EXPENSE, "5000"),
-            ("5200", "Despesas Administrativas", AccountType.EXPENSE, "5000"),
-        ]
-        
         print("Creating sample accounts...")
-        for code, name, acc_type, parent in sample_accounts:
-            account_def = AccountDefinition(
+        account_defs = [
+            AccountDefinition(
                 account_code=code,
                 account_name=name,
-                account_type=acc_type,
+                account_type=AccountType(acc_type),
                 parent_account_code=parent,
                 description=f"Conta de exemplo: {name}"
             )
-            
-            ledger.create_account(account_def, created_by="setup_script")
-            print(f"  ✓ {code} - {name}")
+            for code, name, acc_type, parent in SAMPLE_ACCOUNTS
+        ]
+        
+        # One transaction for the whole chart
+        ledger.create_accounts(account_defs, created_by="setup_script")
+        
+        for account_def in account_defs:
+            print(f"  ✓ {account_def.account_code} - {account_def.account_name}")
         
         print("✅ Sample accounts created")
         
@@ -243,8 +385,31 @@ def show_next_steps():
     print("=" * 80 + "\n")
 
 
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Ledger System setup")
+    parser.add_argument(
+        "-y", "--yes", action="store_true",
+        help="answer yes to every prompt (non-interactive, for CI)"
+    )
+    parser.add_argument(
+        "--skip-venv", action="store_true",
+        help="do not create a virtual environment; install into the running Python"
+    )
+    parser.add_argument(
+        "--skip-accounts", action="store_true",
+        help="do not create the sample chart of accounts"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main setup routine."""
+    global AUTO_YES
+    
+    args = parse_args()
+    AUTO_YES = args.yes
+    
     print("\n" + "=" * 80)
     print(" " * 20 + "📒 LEDGER SYSTEM SETUP")
     print(" " * 25 + "Version 1.0.0")
@@ -252,27 +417,46 @@ def main():
     
     try:
         check_python_version()
-        create_venv()
         
-        print("\n⚠️  Please activate the virtual environment and re-run this script:")
+        if not (args.skip_venv or in_project_venv()):
+            venv_process = create_venv()
+            
+            # .env does not depend on the venv: set it up meanwhile
+            create_env_file()
+            os.environ[ENV_FILE_DONE] = "1"
+            
+            wait_for_venv(venv_process)
+            
+            # Continue in the venv interpreter; returns only if there is none
+            restart_in_venv()
+            
+            print("\n⚠️  Please activate the virtual environment and re-run this script:")
+            
+            if sys.platform == "win32":
+                print("   env\\Scripts\\activate")
+            else:
+                print("   source env/bin/activate")
+            
+            print("   python -m src.setup\n")
+            return
         
-        if sys.platform == "win32":
-            print("   env\\Scripts\\activate")
+        if args.skip_venv:
+            print("⚠️  Skipping virtual environment: installing into the current Python")
         else:
-            print("   source env/bin/activate")
+            print("✅ Running in virtual environment")
         
-        print("   python -m src.setup\n")
+        install_dependencies(use_venv=not args.skip_venv)
         
-        # Check if we're in a venv
-        if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-            print("✅ Running in virtual environment")
-            install_dependencies()
+        # Already done before restarting in the venv
+        if not os.environ.get(ENV_FILE_DONE):
             create_env_file()
-            initialize_database()
+        
+        initialize_database()
+        
+        if not args.skip_accounts:
             create_sample_accounts()
-            show_next_steps()
-        else:
-            print("⚠️  Not running in virtual environment yet")
+        
+        show_next_steps()
         
     except KeyboardInterrupt:
         print("\n\n❌ Setup interrupted by user")
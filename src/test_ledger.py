@@ -7,51 +7,103 @@ Comprehensive test suite for the Ledger / Accounting Engine.
 Run tests:
     pytest test_ledger.py -v
     pytest test_ledger.py -v --cov=.
+    pytest test_ledger.py -n auto    # parallel (pytest-xdist)
+
+Tests are independent: each one gets its own in-memory database (or
+tmp_path file), and xdist workers are separate processes.
 """
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from decimal import Decimal
+import hashlib
+import json
 import os
+import sqlite3
+from types import SimpleNamespace
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 
 from src.ledger_engine import (
     LedgerEngine, AccountDefinition, AccountType,
-    TransactionInput, JournalEntryInput, EntryType
+    TransactionInput, JournalEntryInput, EntryType, AuditLog, JournalEntry,
+    Transaction, AccountBalanceDaily
 )
 from src.ledger_reporting import LedgerReportEngine
 
 
+# Valores usados em vários testes (Decimal é imutável, pode ser compartilhado)
+D1000, D500, D300, D0 = Decimal("1000.00"), Decimal("500.00"), Decimal("300.00"), Decimal("0.00")
+
+
+@pytest.fixture(scope="session")
+def schema_template():
+    """Banco SQLite em memória com o esquema criado uma única vez por sessão."""
+    template = LedgerEngine('sqlite:///:memory:', engine_kwargs={
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    })
+    connection = template.engine.raw_connection()
+    
+    yield connection.driver_connection
+    
+    connection.close()
+    template.engine.dispose()
+
+
 @pytest.fixture(scope="function")
-def ledger():
+def ledger(schema_template, monkeypatch):
     """Cria instância do ledger para testes.
     
     Usa escopo de função com banco de dados em memória SQLite para cada teste.
-    Isso garante isolamento completo entre os testes.
+    Isso garante isolamento completo entre os testes. Cada banco é uma cópia
+    (backup do SQLite) do esquema já criado, sem repetir o DDL. StaticPool
+    mantém uma única conexão, de modo que todas as sessões veem o mesmo banco.
     """
-    # Salva URI original
-    original_uri = os.environ.get('LEDGER_DB_URI')
+    def copy_schema():
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        schema_template.backup(connection)
+        return connection
     
-    # Configura URI para banco em memória
-    test_db_uri = 'sqlite:///:memory:'
-    os.environ['LEDGER_DB_URI'] = test_db_uri
+    # Configura URI para banco em memória (restaurada pelo monkeypatch)
+    monkeypatch.setenv('LEDGER_DB_URI', 'sqlite:///:memory:')
     
     # Cria nova instância do engine
-    engine = LedgerEngine()
+    engine = LedgerEngine(engine_kwargs={
+        'poolclass': StaticPool,
+        'creator': copy_schema
+    })
     
     # Yield do engine para o teste
     yield engine
     
     # Cleanup: Fecha conexões
-    try:
-        engine.engine.dispose()
-    except:
-        pass
+    engine.engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def file_ledger(tmp_path):
+    """Cria ledger em banco SQLite em arquivo, para testes com várias threads.
+    
+    O banco é descartável: os PRAGMAs dispensam o fsync a cada commit.
+    """
+    engine = LedgerEngine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    
+    @event.listens_for(engine.engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
     
-    # Restaura URI original
-    if original_uri:
-        os.environ['LEDGER_DB_URI'] = original_uri
-    else:
-        os.environ.pop('LEDGER_DB_URI', None)
+    # Conexões abertas pelo create_all() ainda não têm os PRAGMAs
+    engine.engine.dispose()
+    
+    yield engine
+    
+    engine.engine.dispose()
 
 
 @pytest.fixture(scope="function")
@@ -77,6 +129,29 @@ def ledger_with_accounts(ledger):
     return ledger
 
 
+@pytest.fixture(scope="function")
+def sale(ledger_with_accounts):
+    """Lança uma venda de 1000.00 (débito 1100, crédito 4100) e retorna seu ID."""
+    return _post_balanced(ledger_with_accounts, "1100", "4100", D1000, "Sale")
+
+
+def _post_balanced(ledger, debit, credit, amount, description="Test", business_event_type="SALE"):
+    """Lança uma transação de duas partidas (débito e crédito de amount) e retorna seu ID."""
+    return ledger.post_transaction(
+        TransactionInput(
+            business_event_type=business_event_type,
+            description=description,
+            transaction_date=datetime.now(timezone.utc),
+            entries=[
+                JournalEntryInput(debit, EntryType.DEBIT, amount),
+                JournalEntryInput(credit, EntryType.CREDIT, amount)
+            ]
+        ),
+        created_by="test_user",
+        source_system="TEST"
+    )
+
+
 class TestChartOfAccounts:
     """Testa funcionalidades do Plano de Contas."""
     
@@ -129,6 +204,31 @@ class TestChartOfAccounts:
         account_id = ledger.create_account(child_def, created_by="test_user")
         assert account_id is not None
     
+    def test_create_accounts_batch(self, ledger):
+        """Testa criação de várias contas em uma única transação."""
+        account_ids = ledger.create_accounts(
+            [
+                AccountDefinition("1000", "Assets", AccountType.ASSET),
+                AccountDefinition("1100", "Cash", AccountType.ASSET, "1000"),
+            ],
+            created_by="test_user"
+        )
+        
+        assert len(account_ids) == 2
+        assert ledger.get_account("1100")['level'] == 2
+        
+        # Falha de uma conta desfaz o lote inteiro
+        with pytest.raises(ValueError, match="Parent account 9000 not found"):
+            ledger.create_accounts(
+                [
+                    AccountDefinition("2000", "Liabilities", AccountType.LIABILITY),
+                    AccountDefinition("2100", "Payables", AccountType.LIABILITY, "9000"),
+                ],
+                created_by="test_user"
+            )
+        
+        assert ledger.get_account("2000") is None
+    
     def test_get_account(self, ledger):
         """Testa obtenção de conta."""
         account_def = AccountDefinition(
@@ -154,12 +254,12 @@ class TestTransactions:
             JournalEntryInput(
                 account_code="1100",
                 entry_type=EntryType.DEBIT,
-                amount=Decimal("1000.00")
+                amount=D1000
             ),
             JournalEntryInput(
                 account_code="4100",
                 entry_type=EntryType.CREDIT,
-                amount=Decimal("1000.00")
+                amount=D1000
             )
         ]
         
@@ -185,7 +285,7 @@ class TestTransactions:
             JournalEntryInput(
                 account_code="1100",
                 entry_type=EntryType.DEBIT,
-                amount=Decimal("1000.00")
+                amount=D1000
             ),
             JournalEntryInput(
                 account_code="4100",
@@ -214,12 +314,12 @@ class TestTransactions:
             JournalEntryInput(
                 account_code="9999",  # Invalid
                 entry_type=EntryType.DEBIT,
-                amount=Decimal("1000.00")
+                amount=D1000
             ),
             JournalEntryInput(
                 account_code="4100",
                 entry_type=EntryType.CREDIT,
-                amount=Decimal("1000.00")
+                amount=D1000
             )
         ]
         
@@ -237,29 +337,10 @@ class TestTransactions:
                 source_system="TEST"
             )
     
-    def test_reverse_transaction(self, ledger_with_accounts):
+    def test_reverse_transaction(self, ledger_with_accounts, sale):
         """Testa reversão de transação."""
-        # Post original
-        entries = [
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-        ]
-        
-        transaction = TransactionInput(
-            business_event_type="SALE",
-            description="To reverse",
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
-        )
-        
-        original_id = ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
-            source_system="TEST"
-        )
-        
         reversal_id = ledger_with_accounts.reverse_transaction(
-            transaction_id=original_id,
+            transaction_id=sale,
             reversal_reason="Test reversal",
             reversed_by="test_user",
             source_system="TEST"
@@ -271,30 +352,12 @@ class TestTransactions:
 class TestBalances:
     """Testa cálculos de saldos."""
     
-    def test_account_balance_after_transaction(self, ledger_with_accounts):
+    def test_account_balance_after_transaction(self, ledger_with_accounts, sale):
         """Testa saldo após transação."""
-        entries = [
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-        ]
-        
-        transaction = TransactionInput(
-            business_event_type="SALE",
-            description="Balance test",
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
-        )
-        
-        ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
-            source_system="TEST"
-        )
-        
         balance = ledger_with_accounts.get_account_balance("1100")
-        assert balance == Decimal("1000.00")
+        assert balance == D1000
     
-    def test_balance_after_reversal(self, ledger_with_accounts):
+    def test_balance_after_reversal(self, ledger_with_accounts, sale):
         """Testa saldo após reversão.
         
         IMPORTANTE: Quando uma transação é revertida:
@@ -308,23 +371,7 @@ class TestBalances:
         - Reversão: Crédito 1100 (-1000), Débito 4100 (-1000) - STATUS: POSTED (conta)
         - Saldo final em 1100: -1000 (apenas a reversão é contada)
         """
-        entries = [
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-        ]
-        
-        transaction = TransactionInput(
-            business_event_type="SALE",
-            description="To reverse",
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
-        )
-        
-        original_id = ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
-            source_system="TEST"
-        )
+        original_id = sale
         
         ledger_with_accounts.reverse_transaction(
             transaction_id=original_id,
@@ -342,60 +389,45 @@ class TestBalances:
 class TestIntegrity:
     """Testa verificações de integridade."""
     
-    def test_verify_integrity_valid(self, ledger_with_accounts):
+    def test_verify_integrity_valid(self, ledger_with_accounts, sale):
         """Testa verificação de integridade válida."""
-        entries = [
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-        ]
-        
-        transaction = TransactionInput(
-            business_event_type="SALE",
-            description="Integrity test",
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
-        )
-        
-        ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
-            source_system="TEST"
-        )
-        
         is_valid, errors = ledger_with_accounts.verify_double_entry_integrity()
         assert is_valid is True
         assert len(errors) == 0
     
+    def test_verify_integrity_detects_unbalanced(self, ledger_with_accounts):
+        """Testa detecção de transação desbalanceada."""
+        transaction_id = _post_balanced(ledger_with_accounts, "1100", "4100", Decimal("100.00"), "Sale")
+        
+        # Corrompe um lançamento diretamente no banco
+        with ledger_with_accounts.SessionLocal() as session:
+            session.query(JournalEntry)\
+                .filter(
+                    JournalEntry.transaction_id == transaction_id,
+                    JournalEntry.entry_type == "CREDIT"
+                )\
+                .update({JournalEntry.amount: Decimal("90.00")})
+            session.commit()
+        
+        is_valid, errors = ledger_with_accounts.verify_double_entry_integrity()
+        
+        assert is_valid is False
+        assert len(errors) == 1
+        assert errors[0].endswith("Debits (100.00) != Credits (90.00)")
+    
     def test_trial_balance(self, ledger_with_accounts):
         """Testa balancete de verificação."""
         # Post transactions
         transactions = [
             # Sale
-            ([
-                JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-                JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-            ], "SALE", "Sale"),
+            ("1100", "4100", D1000, "Sale", "SALE"),
             
             # Expense
-            ([
-                JournalEntryInput("5100", EntryType.DEBIT, Decimal("400.00")),
-                JournalEntryInput("1100", EntryType.CREDIT, Decimal("400.00"))
-            ], "EXPENSE", "Expense")
+            ("5100", "1100", Decimal("400.00"), "Expense", "EXPENSE")
         ]
         
-        for entries_list, event_type, desc in transactions:
-            transaction = TransactionInput(
-                business_event_type=event_type,
-                description=desc,
-                transaction_date=datetime.now(timezone.utc),
-                entries=entries_list
-            )
-            
-            ledger_with_accounts.post_transaction(
-                transaction,
-                created_by="test_user",
-                source_system="TEST"
-            )
+        for debit, credit, amount, desc, event_type in transactions:
+            _post_balanced(ledger_with_accounts, debit, credit, amount, desc, event_type)
         
         # Get trial balance
         trial_balance = ledger_with_accounts.get_trial_balance()
@@ -420,30 +452,13 @@ class TestReporting:
         """Testa geração de balanço patrimonial."""
         # Post some transactions
         transactions = [
-            ([
-                JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-                JournalEntryInput("3000", EntryType.CREDIT, Decimal("1000.00"))
-            ], "INVESTMENT", "Initial capital"),
+            ("1100", "3000", D1000, "Initial capital", "INVESTMENT"),
             
-            ([
-                JournalEntryInput("1200", EntryType.DEBIT, Decimal("500.00")),
-                JournalEntryInput("4100", EntryType.CREDIT, Decimal("500.00"))
-            ], "SALE", "Credit sale")
+            ("1200", "4100", D500, "Credit sale", "SALE")
         ]
         
-        for entries, event_type, desc in transactions:
-            transaction = TransactionInput(
-                business_event_type=event_type,
-                description=desc,
-                transaction_date=datetime.now(timezone.utc),
-                entries=entries
-            )
-            
-            ledger_with_accounts.post_transaction(
-                transaction,
-                created_by="test_user",
-                source_system="TEST"
-            )
+        for debit, credit, amount, desc, event_type in transactions:
+            _post_balanced(ledger_with_accounts, debit, credit, amount, desc, event_type)
         
         # Generate balance sheet
         report_engine = LedgerReportEngine(ledger_with_accounts)
@@ -464,27 +479,743 @@ class TestReporting:
         assert 'totals' in balance_sheet
         assert balance_sheet['totals']['total_assets'] > 0
     
-    def test_report_integrity_verification(self, ledger_with_accounts):
-        """Testa relatório de verificação de integridade."""
-        # Post transaction
-        entries = [
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
+    def test_report_audit_event_uses_generated_at(self, ledger_with_accounts):
+        """Testa que o evento de auditoria usa o mesmo horário do relatório."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        balance_sheet = report_engine.generate_balance_sheet(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        with ledger_with_accounts.SessionLocal() as session:
+            event = session.query(AuditLog)\
+                .filter(AuditLog.event_type == "REPORT_GENERATED")\
+                .one()
+            
+            # SQLite não preserva o fuso horário
+            generated_at = datetime.fromisoformat(balance_sheet['generated_at'])
+            assert event.event_timestamp.replace(tzinfo=None) == generated_at.replace(tzinfo=None)
+    
+    def test_reports_cached_until_ledger_changes(self, ledger_with_accounts):
+        """Testa que relatórios repetidos vêm do cache até novo lançamento."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        def post_sale():
+            _post_balanced(ledger_with_accounts, "1100", "4100", Decimal("100.00"), "Sale")
+        
+        post_sale()
+        as_of_date = datetime(2999, 12, 31, tzinfo=timezone.utc)
+        
+        # Só pedidos repetidos entram no cache
+        one_off = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        first = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        assert first['report_id'] != one_off['report_id']
+        first['assets'].clear()
+        
+        second = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        assert second['report_id'] == first['report_id']
+        assert second['totals']['total_assets'] == 100.0
+        assert report_engine.verify_report_integrity(second) is True
+        
+        # Cada acesso ao cache também é auditado
+        with ledger_with_accounts.SessionLocal() as session:
+            hit = session.query(AuditLog)\
+                .filter(
+                    AuditLog.event_type == "REPORT_GENERATED",
+                    AuditLog.description.like("%served from cache%")
+                )\
+                .one()
+            hit_metadata = json.loads(hit.event_metadata)
+            assert hit_metadata['report_id'] == first['report_id']
+            assert hit_metadata['report_hash'] == first['report_hash']
+            assert hit_metadata['cache_hit'] is True
+        
+        post_sale()
+        
+        third = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        assert third['report_id'] != first['report_id']
+        assert third['totals']['total_assets'] == 200.0
+    
+    def test_report_cache_disabled(self, ledger_with_accounts, monkeypatch):
+        """Testa que o cache desativado não consulta a marca d'água."""
+        report_engine = LedgerReportEngine(ledger_with_accounts, report_cache_size=0)
+        
+        def watermark():
+            raise AssertionError("watermark queried")
+        
+        monkeypatch.setattr(report_engine, '_ledger_watermark', watermark)
+        
+        as_of_date = datetime(2999, 12, 31, tzinfo=timezone.utc)
+        first = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        second = report_engine.generate_balance_sheet(as_of_date, "test_user")
+        
+        assert second['report_id'] != first['report_id']
+    
+    def test_balance_sheet_uses_daily_summary(self, ledger_with_accounts):
+        """Testa balanço lido do resumo diário mais lançamentos posteriores."""
+        def post_sale(amount):
+            return _post_balanced(ledger_with_accounts, "1100", "4100", amount, "Sale")
+        
+        # Lançamento antigo (três dias atrás) e lançamento de hoje
+        old_id = post_sale(Decimal("100.00"))
+        post_sale(Decimal("50.00"))
+        
+        three_days_ago = datetime.now(timezone.utc) - timedelta(days=3)
+        with ledger_with_accounts.SessionLocal() as session:
+            session.query(Transaction)\
+                .filter(Transaction.transaction_id == old_id)\
+                .update({Transaction.posting_date: three_days_ago})
+            session.commit()
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+        
+        # Dias recentes ainda podem receber lançamentos em trânsito
+        with pytest.raises(ValueError):
+            report_engine.refresh_balance_summary(yesterday, "test_user")
+        
+        assert report_engine.refresh_balance_summary(yesterday - timedelta(days=1), "test_user") == 2
+        
+        def total_assets(as_of_date):
+            return report_engine.generate_balance_sheet(
+                as_of_date, "test_user"
+            )['totals']['total_assets']
+        
+        assert total_assets(datetime.now(timezone.utc)) == 150.0
+        assert total_assets(three_days_ago) == 100.0
+        assert total_assets(three_days_ago - timedelta(days=1)) == 0
+        
+        # O resumo é de fato lido: alterá-lo muda o balanço
+        with ledger_with_accounts.SessionLocal() as session:
+            session.query(AccountBalanceDaily)\
+                .filter(AccountBalanceDaily.account_code == "1100")\
+                .update({AccountBalanceDaily.net_debit_cents: 20000})
+            session.commit()
+        
+        assert total_assets(datetime.now(timezone.utc) + timedelta(seconds=1)) == 250.0
+        
+        # Estorno invalida o resumo até o próximo refresh
+        ledger_with_accounts.reverse_transaction(
+            old_id,
+            reversal_reason="Test",
+            reversed_by="test_user",
+            source_system="TEST"
+        )
+        
+        expected = sum(
+            float(a['balance']) for a in ledger_with_accounts.get_trial_balance()
+            if a['account_type'] == "ASSET"
+        )
+        assert total_assets(datetime.now(timezone.utc) + timedelta(seconds=2)) == expected
+    
+    def test_balance_sheet_skips_netted_accounts(self, ledger_with_accounts):
+        """Testa que contas com movimento mas saldo zero são omitidas."""
+        transactions = [
+            ("1100", "3000", D500),
+            ("1200", "1100", D500)
         ]
         
-        transaction = TransactionInput(
-            business_event_type="SALE",
-            description="Integrity test",
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
+        for debit, credit, amount in transactions:
+            _post_balanced(ledger_with_accounts, debit, credit, amount, "Transfer", "TRANSFER")
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        balance_sheet = report_engine.generate_balance_sheet(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
         )
         
-        ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
+        assert [a['account_code'] for a in balance_sheet['assets']] == ["1200"]
+        assert [e['account_code'] for e in balance_sheet['equity']] == ["3000"]
+    
+    def test_balances_sum_exact_cents(self, ledger_with_accounts):
+        """Testa que somas de centavos não acumulam erro de ponto flutuante."""
+        transactions = [
+            ("1100", "3000", Decimal("0.10")),
+            ("1100", "3000", Decimal("0.20")),
+            ("1200", "1100", Decimal("0.30"))
+        ]
+        
+        for debit, credit, amount in transactions:
+            _post_balanced(ledger_with_accounts, debit, credit, amount, "Transfer", "TRANSFER")
+        
+        assert ledger_with_accounts.get_account_balance("1100") == D0
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        balance_sheet = report_engine.generate_balance_sheet(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        assert balance_sheet['assets'] == [
+            {'account_code': '1200', 'account_name': 'Accounts Receivable', 'balance': 0.3}
+        ]
+    
+    def test_reports_convert_decimal_cents(self, ledger_with_accounts, tmp_path, monkeypatch):
+        """Testa saldos em centavos Decimal (MySQL/PostgreSQL) convertidos para float."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        rows = [
+            SimpleNamespace(account_code="1100", account_name="Cash",
+                            account_type="ASSET", balance_cents=Decimal(100050)),
+            SimpleNamespace(account_code="4100", account_name="Sales Revenue",
+                            account_type="REVENUE", balance_cents=Decimal(100050)),
+        ]
+        
+        def query_account_balances(session, as_of_date, start_date=None, account_types=None, **kwargs):
+            types = {t.value for t in account_types} if account_types else None
+            return [row for row in rows if types is None or row.account_type in types]
+        
+        monkeypatch.setattr(report_engine, '_query_account_balances', query_account_balances)
+        
+        now = datetime.now(timezone.utc)
+        balance_sheet = report_engine.generate_balance_sheet(now, "test_user")
+        income_statement = report_engine.generate_income_statement(now, now, "test_user")
+        
+        assert balance_sheet['assets'][0]['balance'] == 1000.5
+        assert type(balance_sheet['assets'][0]['balance']) is float
+        assert type(balance_sheet['totals']['total_assets']) is float
+        assert type(income_statement['revenues'][0]['balance']) is float
+        assert type(income_statement['totals']['net_income']) is float
+        
+        for report in (balance_sheet, income_statement):
+            report_engine.export_to_json(report, str(tmp_path / f"{report['report_id']}.json"))
+    
+    def test_export_balance_sheet_csv(self, ledger_with_accounts, tmp_path):
+        """Testa exportação CSV sem alterar o relatório."""
+        _post_balanced(ledger_with_accounts, "1100", "3000", D1000, "Initial capital", "INVESTMENT")
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        balance_sheet = report_engine.generate_balance_sheet(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        filename = tmp_path / "balance_sheet.csv"
+        report_engine.export_to_csv(balance_sheet, str(filename))
+        
+        # Formato fixo: sem aspas, valores float com parte decimal
+        assert filename.read_text(encoding='utf-8') == (
+            "account_code,account_name,balance,section\n"
+            "1100,Cash,1000.0,assets\n"
+            "3000,Equity,1000.0,equity\n"
+        )
+        assert report_engine.verify_report_integrity(balance_sheet) is True
+    
+    def test_balance_sheet_matches_account_balances(self, ledger_with_accounts):
+        """Testa que o balanço agregado confere com get_account_balance."""
+        _post_balanced(ledger_with_accounts, "1100", "3000", D1000, "Initial capital", "INVESTMENT")
+        
+        # Transação revertida não deve contar no saldo
+        reversed_id = _post_balanced(
+            ledger_with_accounts, "1200", "2100", Decimal("250.00"), "To reverse", "PURCHASE"
+        )
+        
+        ledger_with_accounts.reverse_transaction(
+            transaction_id=reversed_id,
+            reversal_reason="Test reversal",
+            reversed_by="test_user",
             source_system="TEST"
         )
         
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        balance_sheet = report_engine.generate_balance_sheet(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            include_zero_balances=True
+        )
+        
+        reported = {
+            account['account_code']: account['balance']
+            for section in ('assets', 'liabilities', 'equity')
+            for account in balance_sheet[section]
+        }
+        
+        assert set(reported) == {"1000", "1100", "1200", "2000", "2100", "3000"}
+        
+        for account_code, balance in reported.items():
+            assert balance == float(ledger_with_accounts.get_account_balance(account_code))
+        
+        assert reported["1100"] == 1000.0
+        assert reported["3000"] == 1000.0
+        assert reported["1200"] == -250.0
+        assert reported["2100"] == -250.0
+    
+    def test_generate_income_statement(self, ledger_with_accounts):
+        """Testa demonstração de resultados no período."""
+        transactions = [
+            ("1100", "4100", D1000, "Sale", "SALE"),
+            
+            ("5100", "1100", D300, "Expense", "EXPENSE")
+        ]
+        
+        start_date = datetime.now(timezone.utc)
+        
+        for debit, credit, amount, desc, event_type in transactions:
+            _post_balanced(ledger_with_accounts, debit, credit, amount, desc, event_type)
+        
+        end_date = datetime.now(timezone.utc)
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        income_statement = report_engine.generate_income_statement(
+            start_date=start_date,
+            end_date=end_date,
+            generated_by="test_user"
+        )
+        
+        assert income_statement['revenues'] == [
+            {'account_code': '4100', 'account_name': 'Sales Revenue', 'balance': 1000.0}
+        ]
+        assert income_statement['expenses'] == [
+            {'account_code': '5100', 'account_name': 'Cost of Sales', 'balance': 300.0}
+        ]
+        assert income_statement['totals']['net_income'] == 700.0
+        
+        # Período posterior aos lançamentos não tem movimento
+        empty_statement = report_engine.generate_income_statement(
+            start_date=end_date,
+            end_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        assert empty_statement['revenues'] == []
+        assert empty_statement['expenses'] == []
+    
+    def test_generate_trial_balance_report(self, ledger_with_accounts, sale):
+        """Testa balancete de verificação sem contas zeradas."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        assert report['accounts'] == [
+            {'account_code': '1100', 'account_name': 'Cash',
+             'account_type': 'ASSET', 'balance': 1000.0},
+            {'account_code': '4100', 'account_name': 'Sales Revenue',
+             'account_type': 'REVENUE', 'balance': 1000.0}
+        ]
+        assert report_engine.verify_report_integrity(report) is True
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            include_zero_balances=True
+        )
+        
+        assert len(report['accounts']) == 10
+    
+    def test_export_to_store(self, ledger_with_accounts, tmp_path):
+        """Testa armazenamento endereçado pelo hash do relatório."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            include_zero_balances=True
+        )
+        
+        path = report_engine.export_to_store(report, str(tmp_path))
+        assert os.path.basename(path) == f"{report['report_hash']}.json"
+        assert os.listdir(tmp_path) == [os.path.basename(path)]
+        
+        with open(path, encoding='utf-8') as f:
+            loaded = json.load(f)
+        
+        assert report_engine.verify_report_integrity(loaded, path=path, deep=False) is True
+        assert report_engine.verify_report_integrity(loaded) is True
+        
+        other = str(tmp_path / "other.json")
+        assert report_engine.verify_report_integrity(loaded, path=other, deep=False) is False
+        
+        with pytest.raises(ValueError):
+            report_engine.verify_report_integrity(loaded, deep=False)
+    
+    def test_export_general_ledger_csv(self, ledger_with_accounts, tmp_path):
+        """Testa exportação CSV do razão geral direto do banco."""
+        start_date = datetime.now(timezone.utc)
+        
+        _post_balanced(ledger_with_accounts, "1100", "4100", D1000, "Sale")
+        
+        end_date = datetime.now(timezone.utc)
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        streamed = tmp_path / "streamed.csv"
+        count = report_engine.export_general_ledger_csv(start_date, end_date, str(streamed))
+        assert count == 2
+        
+        from_report = tmp_path / "from_report.csv"
+        report_engine.export_to_csv(
+            report_engine.generate_general_ledger(start_date, end_date, "test_user"),
+            str(from_report)
+        )
+        
+        assert streamed.read_bytes() == from_report.read_bytes()
+        assert b',1000.0,' in streamed.read_bytes()
+    
+    def test_generate_audit_trail(self, ledger_with_accounts):
+        """Testa trilha de auditoria com filtro por tipo de evento."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        audit_trail = report_engine.generate_audit_trail(
+            start_date=datetime(2000, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            event_type="ACCOUNT_CREATED"
+        )
+        
+        assert audit_trail['entry_count'] == 10
+        assert {e['event_type'] for e in audit_trail['entries']} == {"ACCOUNT_CREATED"}
+        assert set(audit_trail['entries'][0]) == {
+            'audit_id', 'event_timestamp', 'event_type', 'severity', 'user_id',
+            'source_system', 'action', 'description', 'transaction_id'
+        }
+        assert isinstance(audit_trail['entries'][0]['event_timestamp'], str)
+        assert report_engine.verify_report_integrity(audit_trail) is True
+    
+    def test_verify_general_ledger_source(self, ledger_with_accounts):
+        """Testa conferência do razão geral contra os lançamentos no banco."""
+        start_date = datetime.now(timezone.utc)
+        
+        for amount in [D1000, Decimal("0.10")]:
+            _post_balanced(ledger_with_accounts, "1100", "4100", amount, "Sale")
+        
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        
+        general_ledger = report_engine.generate_general_ledger(
+            start_date=start_date,
+            end_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        assert report_engine.verify_general_ledger_source(general_ledger) is True
+        
+        general_ledger['entries'][0]['amount'] = 999.0
+        assert report_engine.verify_general_ledger_source(general_ledger) is False
+    
+    def test_export_general_ledger_streams_verifiable_report(self, ledger_with_accounts, tmp_path):
+        """Testa exportação em streaming do razão geral."""
+        start_date = datetime.now(timezone.utc)
+        
+        for amount in (Decimal("100.00"), Decimal("250.50")):
+            _post_balanced(ledger_with_accounts, "1100", "4100", amount, "Sale")
+        
+        end_date = datetime.now(timezone.utc)
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        output_file = tmp_path / "general_ledger.json"
+        
+        header = report_engine.export_general_ledger(
+            start_date=start_date,
+            end_date=end_date,
+            generated_by="test_user",
+            filename=str(output_file)
+        )
+        
+        assert header['entry_count'] == 4
+        assert 'entries' not in header
+        
+        with open(output_file, encoding='utf-8') as f:
+            exported = json.load(f)
+        
+        assert exported['report_hash'] == header['report_hash']
+        assert report_engine.verify_report_integrity(exported) is True
+        
+        in_memory = report_engine.generate_general_ledger(
+            start_date=start_date,
+            end_date=end_date,
+            generated_by="test_user"
+        )
+        
+        assert exported['entries'] == in_memory['entries']
+    
+    def test_verify_legacy_report(self, ledger):
+        """Testa que relatórios sem hash_scheme usam a serialização antiga."""
+        report_engine = LedgerReportEngine(ledger)
+        
+        report = {
+            'report_id': 'legacy',
+            'report_type': 'TRIAL_BALANCE',
+            'accounts': [{'account_code': '1100', 'balance': 600.0}]
+        }
+        report['report_hash'] = hashlib.sha256(
+            json.dumps(report, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        
+        assert report_engine.verify_report_integrity(report) is True
+        
+        report['accounts'][0]['balance'] = 700.0
+        assert report_engine.verify_report_integrity(report) is False
+    
+    def test_msgpack_hash_scheme(self, ledger_with_accounts):
+        """Testa relatórios com hash msgpack."""
+        pytest.importorskip("ormsgpack")
+        
+        from src.ledger_reporting import HASH_SCHEME_MSGPACK
+        
+        report_engine = LedgerReportEngine(
+            ledger_with_accounts,
+            hash_scheme=HASH_SCHEME_MSGPACK
+        )
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            include_zero_balances=True
+        )
+        
+        assert report['hash_scheme'] == HASH_SCHEME_MSGPACK
+        assert report_engine.verify_report_integrity(report) is True
+        
+        report['accounts'][0]['balance'] = 1.0
+        assert report_engine.verify_report_integrity(report) is False
+    
+    def test_blake3_hash_scheme(self, ledger_with_accounts, tmp_path):
+        """Testa relatórios com hash BLAKE3, inclusive exportação em streaming."""
+        pytest.importorskip("blake3")
+        
+        from src.ledger_reporting import HASH_SCHEME_BLAKE3
+        
+        report_engine = LedgerReportEngine(
+            ledger_with_accounts,
+            hash_scheme=HASH_SCHEME_BLAKE3
+        )
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            include_zero_balances=True
+        )
+        
+        assert report['hash_scheme'] == HASH_SCHEME_BLAKE3
+        assert report_engine.verify_report_integrity(report) is True
+        
+        filename = tmp_path / "general_ledger.json"
+        header = report_engine.export_general_ledger(
+            start_date=datetime(2000, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime.now(timezone.utc),
+            generated_by="test_user",
+            filename=str(filename)
+        )
+        
+        with open(filename, encoding='utf-8') as f:
+            exported = json.load(f)
+        
+        assert exported['hash_scheme'] == HASH_SCHEME_BLAKE3
+        assert exported['report_hash'] == header['report_hash']
+        assert report_engine.verify_report_integrity(exported) is True
+        
+        report['accounts'][0]['balance'] = 1.0
+        assert report_engine.verify_report_integrity(report) is False
+    
+    def test_msgpack_hash_scheme_requires_ormsgpack(self, ledger, monkeypatch):
+        """Testa erro ao pedir hash msgpack sem ormsgpack instalado."""
+        from src import ledger_reporting
+        
+        monkeypatch.setattr(ledger_reporting, "ormsgpack", None)
+        
+        with pytest.raises(ValueError, match="requires ormsgpack"):
+            LedgerReportEngine(ledger, hash_scheme=ledger_reporting.HASH_SCHEME_MSGPACK)
+    
+    def test_canonical_json_matches_orjson(self, monkeypatch):
+        """Testa que o fallback stdlib gera os mesmos bytes que o orjson."""
+        pytest.importorskip("orjson")
+        
+        from src import ledger_reporting
+        
+        class Ratio(float):
+            """Subclasse de float, como numpy.float64."""
+        
+        data = {
+            'b': [1, 2.5, 1e16, 1e-7, -0.0, None, True],
+            'a': {'memo': 'Liquidação\n\x0b "e-mail" 1e+16', 'amount': 1000.0},
+            'date': datetime(2024, 1, 31, tzinfo=timezone.utc),
+            'lmt_date': datetime(1900, 1, 1, tzinfo=timezone(-timedelta(minutes=9, seconds=21))),
+            'ratio': Ratio(1.5),
+            'type': AccountType.ASSET,
+            'value': Decimal("10.50")
+        }
+        
+        # Cada membro isolado, para que um não force o fallback dos outros
+        members = [{key: value} for key, value in data.items()] + [data]
+        expected = [ledger_reporting._canonical_json(member) for member in members]
+        
+        monkeypatch.setattr(ledger_reporting, 'orjson', None)
+        
+        assert [ledger_reporting._canonical_json(member) for member in members] == expected
+    
+    def test_canonical_json_orjson_mismatches(self):
+        """Testa que valores que o orjson codifica diferente ou rejeita usam o stdlib."""
+        pytest.importorskip("orjson")
+        
+        from src import ledger_reporting
+        
+        canonical_json = ledger_reporting._canonical_json
+        assert canonical_json({'rate': float('nan')}) == b'{"rate":NaN}'
+        assert canonical_json({'rate': float('-inf')}) == b'{"rate":-Infinity}'
+        assert canonical_json({2025: 'FY', 2024: 'FY'}) == b'{"2024":"FY","2025":"FY"}'
+        assert canonical_json({'cents': 2 ** 70}) == b'{"cents":1180591620717411303424}'
+    
+    def test_canonical_json_fast_path_ignores_strings(self, monkeypatch):
+        """Testa que UUIDs com 'e' seguido de dígito usam o orjson."""
+        pytest.importorskip("orjson")
+        
+        from src import ledger_reporting
+        
+        def stdlib_dumps(*args, **kwargs):
+            raise AssertionError("stdlib fallback used")
+        
+        monkeypatch.setattr(ledger_reporting, 'json', SimpleNamespace(dumps=stdlib_dumps))
+        
+        data = {'transaction_id': 'a1e4c9f0-3e7b-4d2e-9b1a-0e5f6c7d8e9f', 'amount': 12.5}
+        assert ledger_reporting._canonical_json(data) == \
+            b'{"amount":12.5,"transaction_id":"a1e4c9f0-3e7b-4d2e-9b1a-0e5f6c7d8e9f"}'
+    
+    def test_streaming_hash_matches_canonical_json(self, ledger):
+        """Testa que o hash incremental equivale ao hash do JSON canônico."""
+        from src import ledger_reporting
+        
+        report_engine = LedgerReportEngine(ledger)
+        
+        report = {
+            'report_type': 'GENERAL_LEDGER',
+            'hash_scheme': ledger_reporting.HASH_SCHEME,
+            'entries': [
+                {'transaction_number': f'T-{i}', 'amount': i / 4}
+                for i in range(ledger_reporting.HASH_BATCH_ROWS * 2 + 1)
+            ],
+            'errors': [],
+            'totals': {'total_debits': 10.5}
+        }
+        
+        expected = hashlib.sha256(ledger_reporting._canonical_json(report)).hexdigest()
+        
+        assert report_engine._calculate_report_hash(report) == expected
+    
+    def test_generate_all_reports(self, file_ledger):
+        """Testa geração concorrente do conjunto de relatórios."""
+        # Banco em arquivo: cada thread usa sua própria conexão do pool
+        ledger = file_ledger
+        
+        for account_def in [
+            AccountDefinition("1100", "Cash", AccountType.ASSET),
+            AccountDefinition("4100", "Sales Revenue", AccountType.REVENUE),
+        ]:
+            ledger.create_account(account_def, created_by="test_user")
+        
+        start_date = datetime.now(timezone.utc)
+        
+        _post_balanced(ledger, "1100", "4100", D1000, "Sale")
+        
+        end_date = datetime.now(timezone.utc)
+        report_engine = LedgerReportEngine(ledger)
+        
+        reports = report_engine.generate_all(
+            as_of_date=end_date,
+            start_date=start_date,
+            end_date=end_date,
+            generated_by="test_user"
+        )
+        
+        assert set(reports) == {
+            'balance_sheet', 'income_statement', 'trial_balance', 'general_ledger'
+        }
+        
+        for report in reports.values():
+            assert report_engine.verify_report_integrity(report) is True
+        
+        assert reports['balance_sheet']['totals']['total_assets'] == 1000.0
+        assert reports['income_statement']['totals']['net_income'] == 1000.0
+        assert reports['general_ledger']['entry_count'] == 2
+    
+    def test_generate_all_reports_in_memory(self, ledger_with_accounts):
+        """Testa geração do conjunto de relatórios com SQLite em memória."""
+        report_engine = LedgerReportEngine(ledger_with_accounts)
+        now = datetime.now(timezone.utc)
+        
+        reports = report_engine.generate_all(
+            as_of_date=now,
+            start_date=now,
+            end_date=now,
+            generated_by="test_user"
+        )
+        
+        assert {report['report_type'] for report in reports.values()} == {
+            'BALANCE_SHEET', 'INCOME_STATEMENT', 'TRIAL_BALANCE', 'GENERAL_LEDGER'
+        }
+    
+    def test_trial_balance_sees_accounts_from_other_engines(self, file_ledger):
+        """Testa que o balancete inclui contas criadas por outra instância."""
+        file_ledger.create_account(
+            AccountDefinition("1100", "Cash", AccountType.ASSET),
+            created_by="test_user"
+        )
+        report_engine = LedgerReportEngine(file_ledger)
+        
+        other = LedgerEngine(str(file_ledger.engine.url))
+        other.create_account(
+            AccountDefinition("4100", "Sales Revenue", AccountType.REVENUE),
+            created_by="test_user"
+        )
+        _post_balanced(other, "1100", "4100", Decimal("10.00"))
+        other.engine.dispose()
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        
+        assert [(a['account_code'], a['balance']) for a in report['accounts']] == [
+            ("1100", 10.0), ("4100", 10.0)
+        ]
+    
+    def test_async_report_metadata(self, file_ledger):
+        """Testa gravação do evento de auditoria do relatório em segundo plano."""
+        ledger = file_ledger
+        ledger.create_account(
+            AccountDefinition("1100", "Cash", AccountType.ASSET),
+            created_by="test_user"
+        )
+        
+        report_engine = LedgerReportEngine(ledger, async_report_metadata=True)
+        
+        report = report_engine.generate_trial_balance_report(
+            as_of_date=datetime.now(timezone.utc),
+            generated_by="test_user"
+        )
+        report_engine.flush_report_metadata()
+        
+        with ledger.SessionLocal() as session:
+            events = session.query(AuditLog.event_metadata)\
+                .filter(AuditLog.event_type == "REPORT_GENERATED")\
+                .all()
+        
+        assert len(events) == 1
+        assert json.loads(events[0].event_metadata)['report_id'] == report['report_id']
+        
+        # Um único escritor por processo, não um por engine
+        other_engine = LedgerReportEngine(ledger, async_report_metadata=True)
+        assert other_engine._metadata_pool is report_engine._metadata_pool
+    
+    def test_async_report_metadata_ignored_in_memory(self, ledger):
+        """Testa que o SQLite em memória mantém a gravação síncrona."""
+        report_engine = LedgerReportEngine(ledger, async_report_metadata=True)
+        
+        assert report_engine._metadata_pool is None
+    
+    def test_report_indexes_created(self, ledger):
+        """Testa que os índices usados pelos relatórios existem."""
+        report_engine = LedgerReportEngine(ledger)
+        
+        assert report_engine.get_missing_report_indexes() == []
+    
+    def test_report_integrity_verification(self, ledger_with_accounts, sale):
+        """Testa relatório de verificação de integridade."""
         # Generate report
         report_engine = LedgerReportEngine(ledger_with_accounts)
         
@@ -506,31 +1237,14 @@ def test_full_workflow(ledger_with_accounts):
     # 1. Post multiple transactions
     transactions = [
         # Sale
-        ([
-            JournalEntryInput("1100", EntryType.DEBIT, Decimal("1000.00")),
-            JournalEntryInput("4100", EntryType.CREDIT, Decimal("1000.00"))
-        ], "SALE", "Sale transaction"),
+        ("1100", "4100", D1000, "Sale transaction", "SALE"),
         
         # Expense
-        ([
-            JournalEntryInput("5100", EntryType.DEBIT, Decimal("300.00")),
-            JournalEntryInput("1100", EntryType.CREDIT, Decimal("300.00"))
-        ], "EXPENSE", "Expense transaction"),
+        ("5100", "1100", D300, "Expense transaction", "EXPENSE"),
     ]
     
-    for entries, event_type, desc in transactions:
-        transaction = TransactionInput(
-            business_event_type=event_type,
-            description=desc,
-            transaction_date=datetime.now(timezone.utc),
-            entries=entries
-        )
-        
-        ledger_with_accounts.post_transaction(
-            transaction,
-            created_by="test_user",
-            source_system="TEST"
-        )
+    for debit, credit, amount, desc, event_type in transactions:
+        _post_balanced(ledger_with_accounts, debit, credit, amount, desc, event_type)
     
     # 2. Verify integrity
     is_valid, errors = ledger_with_accounts.verify_double_entry_integrity()